@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Quét toàn bộ dataset glyph (hanzi-writer-data / hanzi-local) -> báo cáo CSV/JSON
+
+- Nguồn: thư mục (đệ quy) hoặc file .zip, có thể truyền nhiều nguồn
+- Mỗi glyph: bbox chính xác (cực trị Bezier), độ lệch tâm, tràn khung 0..1024,
+  độ lệch tính so với --ref-x/--ref-y, mặc định = trung vị tâm của cả dataset
+  (hanzi-writer-data gốc ≈ 512,388; hanzi-local ≈ 512,412)
+  số strokes/medians, đoạn suy biến (median < 2 điểm, điểm trùng, stroke bbox rỗng)
+- Chạy theo lô trên nhiều process (--workers / --batch)
+- Sắp xếp theo cột bất kỳ (--sort), chỉ xuất glyph bất thường (--only-outliers)
+
+Ví dụ:
+  python audit_glyphs.py node_modules/hanzi-writer-data . -o audit.csv --only-outliers
+  python audit_glyphs.py data.zip -o audit.json --sort overflow --ref-y 388
+Glyph hỏng (JSON không phải object, path sai cú pháp...) không làm dừng cả lượt quét,
+chỉ ghi 1 dòng với issues = parse-error / error: ...
+"""
+
+import csv, json, time, argparse
+from statistics import median
+from concurrent.futures import ProcessPoolExecutor
+
+from glyph_io import iter_entries, char_of, batched
+from svg_to_hanzi_json import bbox_of_d, TARGET
+
+FIELDS = ["char","file","strokes","medians","minx","miny","maxx","maxy",
+          "w","h","cx","cy","off_x","off_y","off","overflow","degenerate","issues"]
+
+def audit_glyph(name, data, eps=1e-3):
+    """-> row chưa có độ lệch tâm (xem apply_offsets)"""
+    if not isinstance(data, dict): raise TypeError(f"glyph phải là object JSON, gặp {type(data).__name__}")
+    strokes = data.get("strokes") or []
+    medians = data.get("medians") or []
+    row = {"char": char_of(name, data), "file": name,
+           "strokes": len(strokes), "medians": len(medians)}
+    issues = []; degen = 0
+    xs0, ys0, xs1, ys1 = [], [], [], []
+    for d in strokes:
+        try: bb = bbox_of_d(d) if d else None
+        except (ValueError, IndexError, AttributeError, TypeError): bb = None
+        if not bb:
+            degen += 1; continue
+        if bb[2]-bb[0] <= eps or bb[3]-bb[1] <= eps: degen += 1
+        xs0.append(bb[0]); ys0.append(bb[1]); xs1.append(bb[2]); ys1.append(bb[3])
+    for seg in medians:
+        if len(seg) < 2: degen += 1
+        for (ax,ay),(bx,by) in zip(seg, seg[1:]):
+            if abs(bx-ax) <= eps and abs(by-ay) <= eps: degen += 1
+        for x,y in seg:
+            xs0.append(x); ys0.append(y); xs1.append(x); ys1.append(y)
+
+    if not xs0:
+        row.update(minx="", miny="", maxx="", maxy="", w="", h="", cx="", cy="", overflow="")
+        issues.append("empty")
+    else:
+        minx, miny, maxx, maxy = min(xs0), min(ys0), max(xs1), max(ys1)
+        over = max(0.0, -minx, -miny, maxx-TARGET, maxy-TARGET)
+        row.update(minx=round(minx,2), miny=round(miny,2), maxx=round(maxx,2), maxy=round(maxy,2),
+                   w=round(maxx-minx,2), h=round(maxy-miny,2),
+                   cx=round((minx+maxx)/2.0,2), cy=round((miny+maxy)/2.0,2), overflow=round(over,2))
+        if over > 0: issues.append("overflow")
+    if strokes and medians and len(strokes) != len(medians): issues.append("count-mismatch")
+    if degen: issues.append("degenerate")
+    row["degenerate"] = degen
+    row["issues"] = ";".join(issues)
+    return row
+
+def audit_batch(batch):
+    rows = []
+    for name, raw in batch:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            rows.append({"char": char_of(name), "file": name, "issues": f"parse-error: {e}"})
+            continue
+        try:
+            rows.append(audit_glyph(name, data))
+        except Exception as e:   # 1 glyph hỏng không được làm dừng cả lượt quét
+            rows.append({"char": char_of(name, data), "file": name,
+                         "issues": f"error: {type(e).__name__}: {e}"})
+    return rows
+
+def apply_offsets(rows, ref_x=None, ref_y=None, max_off=24.0):
+    """Độ lệch tâm so với (ref_x, ref_y); None = trung vị tâm các glyph -> (ref_x, ref_y)"""
+    cs = [r for r in rows if r.get("cx", "") != ""]
+    if ref_x is None: ref_x = median(r["cx"] for r in cs) if cs else TARGET/2
+    if ref_y is None: ref_y = median(r["cy"] for r in cs) if cs else TARGET/2
+    for r in cs:
+        off_x = r["cx"] - ref_x; off_y = r["cy"] - ref_y
+        r.update(off_x=round(off_x,2), off_y=round(off_y,2), off=round((off_x*off_x + off_y*off_y)**0.5, 2))
+        if r["off"] > max_off: r["issues"] = ";".join(["off-center"] + [v for v in r["issues"].split(";") if v])
+    return ref_x, ref_y
+
+def scan(sources, workers=None, batch=256, ref_x=None, ref_y=None, max_off=24.0):
+    def entries():
+        for src in sources: yield from iter_entries(src)
+    rows = []
+    if workers == 1:
+        for b in batched(entries(), batch):
+            rows += audit_batch(b)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futs = [ex.submit(audit_batch, b) for b in batched(entries(), batch)]
+            for f in futs: rows += f.result()
+    apply_offsets(rows, ref_x, ref_y, max_off)
+    return rows
+
+def sort_rows(rows, key, desc=True):
+    def k(r):
+        v = r.get(key, "")
+        return (0, v) if isinstance(v, (int, float)) else (-1, 0) if v == "" else (1, str(v))
+    return sorted(rows, key=k, reverse=desc)
+
+def write_report(rows, out_path, fmt=None):
+    fmt = fmt or ("json" if out_path.lower().endswith(".json") else "csv")
+    if fmt == "json":
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=1)
+        return
+    with open(out_path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+        w.writeheader(); w.writerows(rows)
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("sources", nargs="+", help="Thư mục hoặc file .zip chứa *.json")
+    ap.add_argument("-o","--output", default="audit.csv")
+    ap.add_argument("--format", choices=["csv","json"], default=None)
+    ap.add_argument("--sort", default="off", help="Cột để sắp xếp (giảm dần), vd off/overflow/degenerate")
+    ap.add_argument("--asc", action="store_true", help="Sắp xếp tăng dần")
+    ap.add_argument("--only-outliers", action="store_true")
+    ap.add_argument("--max-offset", type=float, default=24.0, help="Ngưỡng lệch tâm (px) để coi là off-center")
+    ap.add_argument("--ref-x", type=float, default=None, help="Tâm tham chiếu trục X (mặc định: trung vị dataset)")
+    ap.add_argument("--ref-y", type=float, default=None,
+                    help="Tâm tham chiếu trục Y (mặc định: trung vị dataset; hanzi-writer-data gốc ≈ 388)")
+    ap.add_argument("--workers", type=int, default=None, help="Mặc định = số CPU")
+    ap.add_argument("--batch", type=int, default=256)
+    ap.add_argument("--verbose", action="store_true")
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    rows=scan(args.sources, workers=args.workers, batch=args.batch,
+              ref_x=args.ref_x, ref_y=args.ref_y, max_off=args.max_offset)
+    n=len(rows)
+    if args.only_outliers: rows=[r for r in rows if r.get("issues")]
+    rows=sort_rows(rows, args.sort, desc=not args.asc)
+    write_report(rows, args.output, args.format)
+    if args.verbose:
+        print(f"[i] glyphs: {n}, outliers: {sum(1 for r in rows if r.get('issues'))}")
+    print(f"[✓] saved: {args.output} ({len(rows)} rows, {time.perf_counter()-t0:.2f}s)")
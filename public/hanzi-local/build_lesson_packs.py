@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đóng gói glyph theo bài học (src/data/*.txt) -> public/hanzi-packs/<id>.json
+
+- Parse bài học giống parseCategoryText (src/utils/charLists.js)
+- Mỗi chữ: cùng thứ tự với loadCharData (src/utils/hanzi.js) — hanzi-writer-data gốc trước
+  (thư mục node_modules/hanzi-writer-data hoặc file .zip), chỉ chữ không có mới lấy hanzi-local;
+  nhờ vậy chữ hiển thị giống nhau dù pack đã tải hay chưa
+- Output là file sinh ra (gitignore), chạy tự động trước `npm run build` (prebuild)
+- Pack giữ nguyên thứ tự bài học, kèm reading + meaning
+- App chỉ cần 1 request + 1 lần JSON.parse cho cả bài (loadLessonPack)
+"""
+
+import os, re, json, time, zipfile, argparse
+
+from glyph_io import member_name
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+HAN_RE = re.compile(r"[〇㐀-䶿一-鿿豈-﫿\U00020000-\U0003134F]")
+
+def parse_item(token):
+    label = token.strip()
+    if not label: return None
+    clean = re.sub(r"^\d+\s*[.)]\s*", "", label)
+    parts = [s.strip() for s in clean.split("-")]
+    reading = meaning = None
+    if len(parts) >= 2:
+        m = HAN_RE.search(parts[0])
+        reading = parts[1] or None
+        meaning = " - ".join(parts[2:]) or None
+    else:
+        m = HAN_RE.search(clean)
+    if not m: return None
+    return {"label": label, "value": m.group(0), "reading": reading, "meaning": meaning}
+
+def parse_lesson(text, file_id):
+    lines = [s.strip() for s in (text or "").splitlines() if s.strip()]
+    if not lines: return None
+    tokens = [s.strip() for s in re.split(r";+", " ".join(lines[1:])) if s.strip()]
+    items = [it for it in (parse_item(t) for t in tokens) if it]
+    return {"id": file_id, "label": lines[0], "items": items}
+
+class GlyphSource:
+    """Tra glyph theo ký tự: thư mục hoặc .zip (chỉ đọc index 1 lần)."""
+    def __init__(self, path):
+        self.path = path; self.zf = None; self.names = {}
+        if path and os.path.isfile(path) and path.lower().endswith(".zip"):
+            self.zf = zipfile.ZipFile(path)
+            for info in self.zf.infolist():
+                n = member_name(info)
+                if n.lower().endswith(".json"):
+                    self.names.setdefault(os.path.basename(n)[:-5], info)
+
+    def get(self, ch):
+        if not self.path: return None
+        if self.zf is not None:
+            n = self.names.get(ch)
+            return json.loads(self.zf.read(n)) if n else None
+        p = os.path.join(self.path, f"{ch}.json")
+        if not os.path.isfile(p): return None
+        with open(p, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+def glyph_payload(data):
+    return {"strokes": data.get("strokes", []), "medians": data.get("medians", []),
+            "radStrokes": data.get("radStrokes", [])}
+
+def build_pack(lesson, local, stock):
+    seen = set(); items = []; missing = []; n_local = 0
+    for it in lesson["items"]:
+        ch = it["value"]
+        if ch in seen: continue
+        seen.add(ch)
+        data = stock.get(ch)
+        if data is None:
+            data = local.get(ch)
+            if data is not None: n_local += 1
+        if data is None:
+            missing.append(ch); continue
+        items.append({"char": ch, "reading": it["reading"], "meaning": it["meaning"],
+                      "data": glyph_payload(data)})
+    pack = {"id": lesson["id"], "label": lesson["label"], "items": items, "missing": missing}
+    return pack, n_local
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("--data", default=os.path.join(ROOT, "src", "data"))
+    ap.add_argument("--local", default=HERE)
+    ap.add_argument("--stock", default=os.path.join(ROOT, "node_modules", "hanzi-writer-data"),
+                    help="Thư mục hoặc .zip của hanzi-writer-data")
+    ap.add_argument("--out", default=os.path.join(ROOT, "public", "hanzi-packs"))
+    ap.add_argument("--verbose", action="store_true")
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    local=GlyphSource(args.local); stock=GlyphSource(args.stock)
+    if not os.path.exists(args.stock):
+        print(f"[!] Không tìm thấy hanzi-writer-data: {args.stock} (chỉ dùng hanzi-local)")
+    os.makedirs(args.out, exist_ok=True)
+    for fn in sorted(os.listdir(args.data)):
+        if not fn.lower().endswith(".txt"): continue
+        file_id = fn[:-4]
+        with open(os.path.join(args.data, fn), "r", encoding="utf-8") as f:
+            lesson = parse_lesson(f.read(), file_id)
+        if not lesson or not lesson["items"]: continue
+        pack, n_local = build_pack(lesson, local, stock)
+        out_path = os.path.join(args.out, f"{file_id}.json")
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(pack, f, ensure_ascii=False, separators=(",",":"))
+        if args.verbose:
+            print(f"[i] {file_id}: {len(pack['items'])} chữ ({n_local} local), thiếu {len(pack['missing'])}")
+        if pack["missing"]:
+            print(f"[!] {file_id}: thiếu glyph {''.join(pack['missing'])}")
+    print(f"[✓] packs -> {args.out} ({time.perf_counter()-t0:.2f}s)")
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import json, re, argparse
+import os, json, re, argparse
+from array import array
+
+from glyph import Glyph
+from glyph_io import iter_entries, is_zip, rel_name, GlyphSink
 
 SIZE = 1024.0
 NUM_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\d*\.\d+)(?:[eE][-+]?\d+)?')
@@ -79,7 +83,9 @@ def bbox_of_path(d:str, steps:int=24):
     if not xs: return None
     return (min(xs), min(ys), max(xs), max(ys))
 
-def transform_path(d:str, s:float, dx:float, dy:float):
+def transform_path(d:str, s:float, dx:float, dy:float, sy:float=None):
+    # sy: scale riêng trục Y (mặc định = s); cung A chỉ chính xác khi rotation = 0
+    if sy is None: sy = s
     ts = path_tokens(d)
     out=[]; i=0; n=len(ts); prev=None; axis=0; apos=0
     while i<n:
@@ -88,17 +94,18 @@ def transform_path(d:str, s:float, dx:float, dy:float):
             prev=t.upper(); out.append(prev); axis=0; apos=0; continue
         v=float(t)
         if prev in ('M','L','T','Q','C','S'):
-            out.append(f'{s*v+dx:.6f}' if axis==0 else f'{s*v+dy:.6f}')
+            out.append(f'{s*v+dx:.6f}' if axis==0 else f'{sy*v+dy:.6f}')
             axis^=1
         elif prev=='H':
             out.append(f'{s*v+dx:.6f}')
         elif prev=='V':
-            out.append(f'{s*v+dy:.6f}')
+            out.append(f'{sy*v+dy:.6f}')
         elif prev=='A':
-            if   apos in (0,1): out.append(f'{s*v:.6f}')
+            if   apos==0: out.append(f'{s*v:.6f}')
+            elif apos==1: out.append(f'{sy*v:.6f}')
             elif apos in (2,3,4): out.append(f'{v:g}')
             elif apos==5: out.append(f'{s*v+dx:.6f}')
-            elif apos==6: out.append(f'{s*v+dy:.6f}')
+            elif apos==6: out.append(f'{sy*v+dy:.6f}')
             apos=(apos+1)%7
         else:
             out.append(f'{v:.6f}')
@@ -107,8 +114,10 @@ def transform_path(d:str, s:float, dx:float, dy:float):
 def center_fit(data, char=None, fit=False, pad=None, pad_x=None, pad_y=None,
                bias_x=0.0, bias_y=0.0, y_up=False,
                balance_x=False, balance_y=False, verbose=False):
-    strokes=data.get("strokes",[])
-    medians=data.get("medians",[])
+    # data: dict JSON của HanziWriter hoặc Glyph (sửa tại chỗ, trả về cùng kiểu)
+    is_glyph=isinstance(data,Glyph)
+    strokes=data.paths if is_glyph else data.get("strokes",[])
+    medians=None if is_glyph else data.get("medians",[])
     bbs=[bbox_of_path(d) for d in strokes if d and d.strip()]
     bbs=[b for b in bbs if b]
     if not bbs:
@@ -156,6 +165,17 @@ def center_fit(data, char=None, fit=False, pad=None, pad_x=None, pad_y=None,
         print(f"[i] scale s={s:.6f}, pad_x={pad_x}, pad_y={pad_y}")
         print(f"[i] translate dx={dx:.2f}, dy={dy:.2f} (y_up={y_up})")
 
+    if is_glyph:
+        for st in data.strokes:
+            if st.path is not None: st.path=transform_path(st.path,s,dx,dy)
+            m=st.median
+            if m is not None:
+                m[0::2]=array("d",[s*x+dx for x in m[0::2]])
+                m[1::2]=array("d",[s*y+dy for y in m[1::2]])
+        if char is not None: data.character=char
+        data.invalidate()
+        return data
+
     data["strokes"]=[transform_path(d,s,dx,dy) for d in strokes]
     data["medians"]=[[[s*x+dx, s*y+dy] for (x,y) in seg] for seg in (medians or [])]
     if char is not None: data["character"]=char
@@ -177,14 +197,35 @@ def main():
     ap.add_argument("--balance-x", action="store_true")
     ap.add_argument("--balance-y", action="store_true")
     ap.add_argument("--verbose", action="store_true")
+    ap.add_argument("--compression", choices=["stored","deflated"], default="deflated",
+                    help="Khi output là .zip")
+    ap.add_argument("--level", type=int, default=None, help="Mức nén deflate (0-9)")
     args=ap.parse_args()
 
+    opts=dict(fit=args.fit,pad=args.pad,pad_x=args.pad_x,pad_y=args.pad_y,bias_x=args.bias_x,
+              bias_y=args.bias_y,y_up=args.y_up,balance_x=args.balance_x,
+              balance_y=args.balance_y,verbose=args.verbose)
+
+    # Hàng loạt: input là .zip hoặc thư mục -> output .zip hoặc thư mục (không giải nén tạm)
+    if is_zip(args.input_json) or os.path.isdir(args.input_json):
+        n_err=0
+        with GlyphSink(args.output_json, args.compression, args.level) as sink:
+            for name, raw in iter_entries(args.input_json):
+                if args.verbose: print(f"[i] {name}")
+                try:
+                    data=json.loads(raw)
+                    if not isinstance(data,dict): raise ValueError("gốc JSON phải là object")
+                    out=center_fit(data,char=args.char,**opts)
+                    sink.write(rel_name(args.input_json,name),
+                               json.dumps(out,ensure_ascii=False))
+                except (ValueError, TypeError, IndexError, AttributeError) as e:
+                    n_err+=1; print(f"[!] {name}: {e}"); continue
+        print(f"[✓] Wrote {sink.count} glyphs -> {args.output_json} ({n_err} lỗi)")
+        return
+
     with open(args.input_json,"r",encoding="utf-8") as f:
         data=json.load(f)
-    out=center_fit(data,char=args.char,fit=args.fit,pad=args.pad,pad_x=args.pad_x,
-                   pad_y=args.pad_y,bias_x=args.bias-x if False else args.bias_x,
-                   bias_y=args.bias_y,y_up=args.y_up,balance_x=args.balance_x,
-                   balance_y=args.balance_y,verbose=args.verbose)
+    out=center_fit(data,char=args.char,**opts)
     with open(args.output_json,"w",encoding="utf-8") as f:
         json.dump(out,f,ensure_ascii=False)
     if args.verbose: print("[✓] Wrote", args.output_json)
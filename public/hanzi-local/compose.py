@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ghép glyph chữ hiếm từ các thành phần có sẵn (hanzi-writer-data, hanzi-local)
+
+- Spec JSON (1 object, list, hoặc JSONL), mỗi chữ:
+  {"char": "竝", "layout": "lr", "ratio": 0.5, "gap": 0.02, "parts": ["立", "立"]}
+- layout: lr / tb (ratio = phần đầu), lmr / tmb (ratio = [a,b,c]),
+  enclose (囗), surround-bl (辶 廴), surround-tl (广 厂), surround-t (冂 門), surround-l (匚)
+  -> chữ bao: parts = [phần bao, phần trong], ratio = độ dày phần bao
+- Mỗi part: ký tự, spec con (có "layout"), hoặc dict {"char", "box": [u0,v0,u1,v1],
+  "strokes": [chỉ số nét], "aspect": true (giữ tỉ lệ), "radical": true (-> radStrokes)}
+  radStrokes của spec con được giữ (đánh lại chỉ số theo "strokes" và vị trí trong chữ)
+  box tính trong khung đơn vị 0..1, v hướng xuống (trái-trên = 0,0)
+- Thành phần được đặt bằng affine kiểu center.transform_path (scale x/y riêng) cho cả
+  strokes và medians; thứ tự nét = thứ tự parts (surround-bl: phần trong trước) hoặc "order"
+- Chỉ mục nguồn dựng 1 lần, thành phần parse + bbox theo nét được cache -> ghép hàng trăm chữ/lần
+- Toạ độ path + median làm tròn --digits chữ số (mặc định 0 = số nguyên như hanzi-writer-data)
+- Thành phần thiếu median cho nét được dùng -> báo lỗi chữ đó (không sinh glyph hỏng)
+- Output: thư mục hoặc .zip (GlyphSink)
+
+Ví dụ:
+  python compose.py rare.json node_modules/hanzi-writer-data . -o composed.zip
+  python compose.py '{"char":"迋","layout":"surround-bl","parts":["辶","王"]}' node_modules/hanzi-writer-data -o .
+"""
+
+import os, json, time, zipfile, argparse
+
+from center import NUM_RE, transform_path
+from glyph import Glyph
+from glyph_io import member_name, GlyphSink
+from svg_to_hanzi_json import bbox_of_d
+
+FRAME = (64.0, 28.0, 960.0, 796.0)   # x0, y0, x1, y1 (+Y hướng lên), cỡ chữ giống các glyph hanzi-local
+SURROUND = {
+    "enclose":     lambda r: [0, 0, 1, 1],
+    "surround-bl": lambda r: [r, 0, 1, 1-r],
+    "surround-tl": lambda r: [r, r, 1, 1],
+    "surround-t":  lambda r: [r, r, 1-r, 1],
+    "surround-l":  lambda r: [r, r, 1, 1-r],
+}
+
+def split_boxes(ratios, gap, vertical):
+    tot = float(sum(ratios)) or 1.0
+    n = len(ratios); free = 1.0 - gap*(n-1)
+    out = []; a = 0.0
+    for r in ratios:
+        b = a + free*r/tot
+        out.append([0, a, 1, b] if vertical else [a, 0, b, 1])
+        a = b + gap
+    return out
+
+def layout_boxes(layout, n, ratio=None, gap=0.0):
+    """-> list box đơn vị [u0,v0,u1,v1] cho n part"""
+    if layout in ("lr", "tb"):
+        r = 0.5 if ratio is None else float(ratio)
+        boxes = split_boxes([r, 1-r], gap, layout == "tb")
+    elif layout in ("lmr", "tmb"):
+        boxes = split_boxes(ratio or [1, 1, 1], gap, layout == "tmb")
+    elif layout in SURROUND:
+        r = (0.2 if layout == "enclose" else 0.3) if ratio is None else float(ratio)
+        inner = [r, r, 1-r, 1-r] if layout == "enclose" else SURROUND[layout](r)
+        inner = [inner[0]+gap, inner[1]+gap, inner[2]-gap, inner[3]-gap] if gap else inner
+        boxes = [[0, 0, 1, 1], inner]
+    else:
+        raise ValueError(f"layout không hỗ trợ: {layout}")
+    if len(boxes) != n:
+        raise ValueError(f"layout {layout} cần {len(boxes)} part, spec có {n}")
+    return boxes
+
+def placement(bb, box, aspect=False):
+    """bbox thành phần (y lên) + box đích (y lên) -> (sx, sy, dx, dy)"""
+    bx0, by0, bx1, by1 = bb; tx0, ty0, tx1, ty1 = box
+    bw, bh = bx1-bx0, by1-by0
+    sx = (tx1-tx0)/bw if bw > 1e-6 else None
+    sy = (ty1-ty0)/bh if bh > 1e-6 else None
+    if sx is None: sx = sy if sy is not None else 1.0
+    if sy is None: sy = sx
+    if aspect: sx = sy = min(sx, sy)
+    # canh theo tâm: khi không giữ tỉ lệ tương đương ánh xạ góc -> góc
+    dx = (tx0+tx1)/2 - sx*(bx0+bx1)/2
+    dy = (ty0+ty1)/2 - sy*(by0+by1)/2
+    return sx, sy, dx, dy
+
+class ComponentCache:
+    """Tra thành phần theo ký tự trên nhiều nguồn (thư mục / .zip); nguồn sau ghi đè nguồn trước."""
+    def __init__(self, sources):
+        self.where = {}; self.zips = []; self.parsed = {}; self.hits = 0
+        for src in sources:
+            if os.path.isfile(src) and src.lower().endswith(".zip"):
+                zf = zipfile.ZipFile(src); self.zips.append(zf)
+                for info in zf.infolist():
+                    n = member_name(info)
+                    if n.lower().endswith(".json"): self.where[os.path.basename(n)[:-5]] = (zf, info)
+            elif os.path.isdir(src):
+                for fn in os.listdir(src):
+                    if fn.lower().endswith(".json"): self.where[fn[:-5]] = (None, os.path.join(src, fn))
+
+    def get(self, ch):
+        """-> (strokes, medians, bbox từng nét) hoặc None; parse 1 lần cho mỗi ký tự"""
+        if ch in self.parsed:
+            self.hits += 1; return self.parsed[ch]
+        loc = self.where.get(ch); comp = None
+        if loc is not None:
+            zf, p = loc
+            if zf is not None: data = json.loads(zf.read(p))
+            else:
+                with open(p, "r", encoding="utf-8") as f: data = json.load(f)
+            strokes = data.get("strokes") or []
+            comp = (strokes, data.get("medians") or [], [bbox_of_d(d) for d in strokes])
+        self.parsed[ch] = comp
+        return comp
+
+    def close(self):
+        for zf in self.zips: zf.close()
+
+def round_path(d, digits=0):
+    return NUM_RE.sub(lambda m: f"{round(float(m.group()), digits) + 0.0:.{digits}f}", d)
+
+def compose(spec, cache, frame=FRAME, digits=None):
+    """Spec -> (strokes, medians, radStrokes) trong khung frame; digits=None: không làm tròn"""
+    parts = spec.get("parts") or []
+    layout = spec.get("layout")
+    boxes = layout_boxes(layout, len(parts), spec.get("ratio"), float(spec.get("gap", 0.0))) \
+        if layout else [None]*len(parts)
+    fx0, fy0, fx1, fy1 = frame
+    placed = []
+    for part, ubox in zip(parts, boxes):
+        if isinstance(part, str): part = {"char": part}
+        ubox = part.get("box", ubox)
+        if ubox is None: raise ValueError("part thiếu box (spec không có layout)")
+        u0, v0, u1, v1 = ubox
+        box = (fx0 + u0*(fx1-fx0), fy1 - v1*(fy1-fy0), fx0 + u1*(fx1-fx0), fy1 - v0*(fy1-fy0))
+        if "layout" in part:
+            strokes, medians, sub_rad = compose(part, cache, frame)
+            bbs = [bbox_of_d(d) for d in strokes]
+        else:
+            comp = cache.get(part.get("char", ""))
+            if comp is None: raise KeyError(part.get("char", ""))
+            strokes, medians, bbs = comp; sub_rad = []
+        idx = part.get("strokes") or range(len(strokes))
+        strokes = [strokes[k] for k in idx]; bbs = [bbs[k] for k in idx]
+        miss = [k for k in idx if k >= len(medians) or not medians[k]]
+        if miss: raise ValueError(f"thành phần {part.get('char', '')} thiếu median cho nét {miss}")
+        medians = [medians[k] for k in idx]
+        bbs = [b for b in bbs if b]
+        if not bbs: raise ValueError(f"thành phần rỗng: {part.get('char', '')}")
+        bb = (min(b[0] for b in bbs), min(b[1] for b in bbs), max(b[2] for b in bbs), max(b[3] for b in bbs))
+        sx, sy, dx, dy = placement(bb, box, part.get("aspect", False))
+        placed.append(([transform_path(d, sx, dx, dy, sy) for d in strokes],
+                       [[[sx*x+dx, sy*y+dy] for x, y in m] for m in medians],
+                       list(range(len(idx))) if part.get("radical") else
+                       [j for j, k in enumerate(idx) if k in sub_rad]))
+
+    order = spec.get("order") or (list(range(len(placed)))[::-1] if layout == "surround-bl"
+                                  else range(len(placed)))
+    strokes = []; medians = []; rad = []
+    for k in order:
+        s, m, r = placed[k]
+        rad += [len(strokes)+j for j in r]
+        strokes += s; medians += m
+    if digits is not None:
+        strokes = [round_path(d, digits) for d in strokes]
+        medians = [[[round(x, digits) + 0.0, round(y, digits) + 0.0] for x, y in m] for m in medians]
+        if digits == 0: medians = [[[int(x), int(y)] for x, y in m] for m in medians]
+    return strokes, medians, rad
+
+def load_specs(arg):
+    if arg.lstrip()[:1] in "{[": text = arg
+    else:
+        with open(arg, "r", encoding="utf-8") as f: text = f.read()
+    try: data = json.loads(text)
+    except ValueError: data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return data if isinstance(data, list) else [data]
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("spec", help="File spec .json/.jsonl hoặc chuỗi JSON")
+    ap.add_argument("sources", nargs="+", help="Thư mục / .zip glyph thành phần (nguồn sau ưu tiên)")
+    ap.add_argument("-o","--output", default="composed", help="Thư mục hoặc .zip")
+    ap.add_argument("--frame", default=",".join(f"{v:g}" for v in FRAME),
+                    help="x0,y0,x1,y1 của khung chữ (+Y lên)")
+    ap.add_argument("--digits", type=int, default=0, help="Số chữ số thập phân của toạ độ (0 = số nguyên)")
+    ap.add_argument("--compression", choices=["stored","deflated"], default="deflated")
+    ap.add_argument("--verbose", action="store_true")
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    frame=tuple(float(v) for v in args.frame.split(","))
+    cache=ComponentCache(args.sources); specs=load_specs(args.spec); n_err=0
+    with GlyphSink(args.output, args.compression) as sink:
+        for spec in specs:
+            ch=spec.get("char","")
+            try: strokes,medians,rad=compose(spec,cache,frame,args.digits)
+            except KeyError as e:
+                print(f"[!] {ch}: không có thành phần {e.args[0]}"); n_err+=1; continue
+            except (ValueError, IndexError) as e:
+                print(f"[!] {ch}: {e}"); n_err+=1; continue
+            sink.write(f"{ch}.json", Glyph.from_lists(ch,strokes,medians,rad).to_json())
+            if args.verbose: print(f"[i] {ch}: {len(strokes)} nét, radStrokes={rad}")
+    cache.close()
+    print(f"[✓] {sink.count} glyph -> {args.output} ({n_err} lỗi, {len(cache.parsed)} thành phần, "
+          f"{cache.hits} lần dùng lại cache, {time.perf_counter()-t0:.2f}s)")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đổi cubic (C/S) trong glyph JSON sẵn có sang quadratic (Q) giống hanzi-writer-data
+
+- Mỗi cubic -> ít Q nhất (chia đều 1, 2, ... đoạn) với sai số <= --tol px (hệ 1024)
+- Toạ độ làm tròn --digits chữ số; sai số làm tròn đã tính vào tol và sai số báo cáo
+- Báo cáo: số cubic -> số quad, sai số lớn nhất đạt được, số ký tự path trước/sau
+  ("trước" = path cubic làm tròn cùng --digits, nên chỉ phản ánh riêng C -> Q; --report CSV)
+- Input/output: file .json, thư mục hoặc .zip (glyph đã có Q/L giữ nguyên hình)
+Với SVG mới dùng thẳng: python svg_to_hanzi_json.py 亯.svg 亯.json --quad-tol 1
+
+Ví dụ:
+  python cubic_to_quad.py . quad_out --tol 1 --report quad.csv
+  python cubic_to_quad.py 亯.json 亯_q.json --tol 0.5 --digits 2
+"""
+
+import os, csv, json, time, argparse
+
+from glyph_io import iter_entries, is_zip, char_of, rel_name, GlyphSink
+from svg_to_hanzi_json import path_to_quads, merge_quad_stats, quad_summary, positive_float
+
+def quadify(data, tol=1.0, digits=1):
+    """Glyph dict -> (glyph dict mới, thống kê cộng dồn các stroke); ValueError nếu glyph/path hỏng"""
+    if not isinstance(data, dict): raise ValueError("gốc JSON phải là object")
+    st = {"cubics": 0, "quads": 0, "max_err": 0.0, "before": 0, "after": 0}
+    strokes = []
+    for d in data.get("strokes") or []:
+        if not isinstance(d, str): raise ValueError(f"stroke phải là chuỗi path, gặp {type(d).__name__}")
+        q, s1 = path_to_quads(d, tol, digits); strokes.append(q); merge_quad_stats(st, s1)
+    out = dict(data); out["strokes"] = strokes
+    return out, st
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("src", help="File .json, thư mục hoặc .zip")
+    ap.add_argument("dst", help="File .json, thư mục hoặc .zip")
+    ap.add_argument("--tol", type=positive_float, default=1.0, help="Sai số tối đa (px hệ 1024)")
+    ap.add_argument("--digits", type=int, default=1, help="Số chữ số thập phân của toạ độ")
+    ap.add_argument("--report", default=None, help="CSV: char, file, cubics, quads, max_err, before, after")
+    ap.add_argument("--compression", choices=["stored","deflated"], default="deflated")
+    args=ap.parse_args()
+
+    t0=time.perf_counter(); total={}; rows=[]; n_err=0
+    single=os.path.isfile(args.src) and not is_zip(args.src) and args.dst.lower().endswith(".json")
+    sink=None if single else GlyphSink(args.dst, args.compression)
+    for name, raw in iter_entries(args.src):
+        try:
+            data=json.loads(raw); out,st=quadify(data,args.tol,args.digits)
+            payload=json.dumps(out,ensure_ascii=False,separators=(",",":"))
+            if single:
+                with open(args.dst,"w",encoding="utf-8") as f: f.write(payload)
+            else: sink.write(rel_name(args.src,name),payload)
+        except ValueError as e:
+            print(f"[!] {name}: {e}"); n_err+=1; continue
+        merge_quad_stats(total,st)
+        rows.append({"char":char_of(name,data),"file":name,**st,"max_err":round(st["max_err"],4)})
+    if sink is not None: sink.close()
+    if args.report:
+        with open(args.report,"w",encoding="utf-8",newline="") as f:
+            w=csv.DictWriter(f,fieldnames=["char","file","cubics","quads","max_err","before","after"])
+            w.writeheader(); w.writerows(rows)
+    print(f"[i] {quad_summary(total)}")
+    print(f"[✓] {len(rows)} glyph -> {args.dst} ({n_err} lỗi, {time.perf_counter()-t0:.2f}s)")
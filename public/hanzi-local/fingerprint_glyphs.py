@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+hanzi-local/*.json -> public/hanzi-assets/ (tên file theo hash)
+
+- Mỗi glyph: minify JSON, hash nội dung -> u<codepoint>.<hash>.json
+  (không tạo .gz sẵn: Vercel tự nén gzip/brotli khi phục vụ)
+- manifest.json: ký tự -> URL đã hash (loadCharData đọc manifest này)
+- Chạy tăng dần: glyph không đổi giữ nguyên hash/file, chỉ ghi lại glyph đã đổi
+- --prune: xoá file hash cũ không còn trong manifest (kể cả .json.gz của bản build cũ)
+- Output là file sinh ra (gitignore), chạy tự động trước `npm run build` (prebuild)
+- Chỉ lấy file tên đúng 1 ký tự (bỏ qua *_fixed.json, file nháp...)
+"""
+
+import os, json, time, hashlib, argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(os.path.dirname(HERE))
+MANIFEST = "manifest.json"
+
+def canonical_bytes(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",",":")).encode("utf-8")
+
+def asset_name(ch: str, digest: str) -> str:
+    return f"u{ord(ch):04X}.{digest}.json"
+
+def load_manifest(out_dir):
+    p = os.path.join(out_dir, MANIFEST)
+    if not os.path.isfile(p): return {}
+    with open(p, "r", encoding="utf-8") as f:
+        return json.load(f).get("files", {})
+
+def fingerprint(src_dir, out_dir, base_url="/hanzi-assets", hash_len=10,
+                prune=False, verbose=False):
+    os.makedirs(out_dir, exist_ok=True)
+    old = load_manifest(out_dir)
+    files = {}; changed = kept = 0
+    for fn in sorted(os.listdir(src_dir)):
+        if not fn.lower().endswith(".json"): continue
+        ch = fn[:-5]
+        if len(ch) != 1: continue
+        with open(os.path.join(src_dir, fn), "r", encoding="utf-8") as f:
+            raw = canonical_bytes(json.load(f))
+        digest = hashlib.sha256(raw).hexdigest()[:hash_len]
+        name = asset_name(ch, digest)
+        path = os.path.join(out_dir, name)
+        entry = {"file": name, "hash": digest, "bytes": len(raw)}
+        if old.get(ch, {}).get("hash") == digest and os.path.isfile(path):
+            files[ch] = entry; kept += 1
+            continue
+        with open(path, "wb") as f: f.write(raw)
+        files[ch] = entry; changed += 1
+        if verbose: print(f"[i] {ch} -> {name} ({len(raw)} B)")
+
+    manifest = {"base": base_url.rstrip("/"), "files": files}
+    with open(os.path.join(out_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    removed = 0
+    if prune:
+        live = {e["file"] for e in files.values()}
+        for fn in os.listdir(out_dir):
+            if fn == MANIFEST or fn in live: continue
+            if fn.startswith("u") and (fn.endswith(".json") or fn.endswith(".json.gz")):
+                os.remove(os.path.join(out_dir, fn)); removed += 1
+    return changed, kept, removed
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("--src", default=HERE)
+    ap.add_argument("--out", default=os.path.join(ROOT, "public", "hanzi-assets"))
+    ap.add_argument("--base-url", default="/hanzi-assets")
+    ap.add_argument("--hash-len", type=int, default=10)
+    ap.add_argument("--prune", action="store_true", help="Xoá file hash cũ")
+    ap.add_argument("--verbose", action="store_true")
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    changed,kept,removed=fingerprint(args.src,args.out,base_url=args.base_url,hash_len=args.hash_len,
+                                     prune=args.prune,verbose=args.verbose)
+    print(f"[✓] {args.out}: {changed} mới/đổi, {kept} giữ nguyên, {removed} đã xoá "
+          f"({time.perf_counter()-t0:.2f}s)")
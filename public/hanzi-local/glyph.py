@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Glyph / Stroke trong bộ nhớ (không cần file tạm)
+
+- Stroke: path outline (str) + median dạng array('d') phẳng [x0,y0,x1,y1,...]
+  (path hoặc median có thể None khi số strokes != số medians)
+- Glyph: character + danh sách Stroke + radStrokes
+- to_dict() luôn trả dict mới (sửa thoải mái); to_json() được cache, tự xoá khi gán
+  character / strokes / rad_strokes; sửa tại chỗ (st.path, st.median, list.append...) thì gọi invalidate()
+
+Ví dụ:
+  from svg_to_hanzi_json import convert_bytes
+  from center import center_fit
+  g = center_fit(convert_bytes(svg_bytes, char="亯"), fit=True, pad=40)
+  payload = g.to_json()
+"""
+
+import json
+from array import array
+
+class Stroke:
+    __slots__ = ("path", "median")
+
+    def __init__(self, path=None, median=None):
+        self.path = path
+        self.median = median if median is None or isinstance(median, array) \
+            else array("d", (v for pt in median for v in pt))
+
+    def median_points(self):
+        m = self.median
+        if m is None: return None
+        return [[m[k], m[k+1]] for k in range(0, len(m), 2)]
+
+    def __repr__(self):
+        n = 0 if self.median is None else len(self.median)//2
+        return f"Stroke(path={len(self.path or '')} chars, median={n} pts)"
+
+class Glyph:
+    __slots__ = ("_character", "_strokes", "_rad_strokes", "_json")
+
+    def __init__(self, character="", strokes=None, rad_strokes=None):
+        self._json = None
+        self.character = character
+        self.strokes = strokes
+        self.rad_strokes = rad_strokes
+
+    @property
+    def character(self): return self._character
+
+    @character.setter
+    def character(self, v): self._character = v or ""; self._json = None
+
+    @property
+    def strokes(self): return self._strokes
+
+    @strokes.setter
+    def strokes(self, v): self._strokes = list(v or []); self._json = None
+
+    @property
+    def rad_strokes(self): return self._rad_strokes
+
+    @rad_strokes.setter
+    def rad_strokes(self, v): self._rad_strokes = list(v or []); self._json = None
+
+    @classmethod
+    def from_lists(cls, character, strokes, medians, rad_strokes=None):
+        n = max(len(strokes), len(medians))
+        items = [Stroke(strokes[k] if k < len(strokes) else None,
+                        medians[k] if k < len(medians) else None) for k in range(n)]
+        return cls(character, items, rad_strokes)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls.from_lists(data.get("character", ""), data.get("strokes") or [],
+                              data.get("medians") or [], data.get("radStrokes"))
+
+    @classmethod
+    def from_json(cls, raw):
+        return cls.from_dict(json.loads(raw))
+
+    @property
+    def paths(self):
+        return [s.path for s in self.strokes if s.path is not None]
+
+    @property
+    def medians(self):
+        return [s.median_points() for s in self.strokes if s.median is not None]
+
+    def invalidate(self):
+        self._json = None
+
+    def to_dict(self):
+        return {"character": self.character, "strokes": self.paths,
+                "medians": self.medians, "radStrokes": list(self.rad_strokes)}
+
+    def to_json(self, **kw):
+        if kw:
+            return json.dumps(self.to_dict(), ensure_ascii=False, **kw)
+        if self._json is None:
+            self._json = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",",":"))
+        return self._json
+
+    def __len__(self):
+        return len(self.strokes)
+
+    def __repr__(self):
+        return f"Glyph({self.character!r}, {len(self.strokes)} strokes)"
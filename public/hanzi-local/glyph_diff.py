@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+So sánh trực quan 2 phiên bản dataset glyph (trước/sau khi đổi center_fit, center_shapes, độ chính xác...)
+
+- Ghép cặp theo tên file giữa OLD và NEW (thư mục hoặc .zip)
+- Raster hoá từng stroke bằng NumPy (even-odd) ở độ phân giải --res, trên khung vuông
+  bao 0..1024 và bbox chung của OLD + NEW (hanzi-writer-data gốc -124..900 không bị cắt);
+  --frame x0,y0,size để cố định khung
+- IoU từng stroke + IoU cả chữ, độ dịch lớn nhất của median (đã resample)
+- Đánh dấu glyph vượt ngưỡng (--min-iou / --max-disp), chạy song song theo lô
+- Báo cáo CSV/JSON (IoU tăng dần), tuỳ chọn ảnh overlay PNG cho glyph bị đánh dấu:
+  xám = trùng, đỏ = chỉ có ở OLD, xanh = chỉ có ở NEW
+
+Ví dụ:
+  python glyph_diff.py old_dir new_dir -o diff.csv --res 192 --png-dir overlays
+"""
+
+import os, csv, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from glyph_io import iter_entries, char_of, batched
+from glyph_np import outline_polygons, rasterize, resample, write_png, TARGET
+
+FIELDS = ["char","file","strokes_old","strokes_new","iou","min_stroke_iou","worst_stroke",
+          "max_disp","flagged","reason"]
+
+def iou(a, b):
+    u = np.count_nonzero(a | b)
+    return 1.0 if u == 0 else np.count_nonzero(a & b) / u
+
+def glyph_polygons(data, tol):
+    return [outline_polygons(d, tol) for d in data.get("strokes") or []]
+
+def common_frame(*stroke_polys):
+    """Khung vuông (x0, y0, size) bao 0..TARGET và mọi polygon"""
+    pts = [p for polys in stroke_polys for ps in polys for p in ps]
+    lo = np.minimum(np.min([p.min(axis=0) for p in pts], axis=0), 0.0) if pts else np.zeros(2)
+    hi = np.maximum(np.max([p.max(axis=0) for p in pts], axis=0), TARGET) if pts else np.full(2, TARGET)
+    return float(lo[0]), float(lo[1]), float(max(hi - lo))
+
+def median_disp(old, new, n=32):
+    mo = old.get("medians") or []; mn = new.get("medians") or []
+    if not mo or not mn: return None
+    return max(float(np.max(np.hypot(*(resample(a, n) - resample(b, n)).T)))
+               for a, b in zip(mo, mn))
+
+def overlay(old_mask, new_mask):
+    img = np.full(old_mask.shape + (3,), 255, dtype=np.uint8)
+    img[old_mask & new_mask] = (90, 90, 90)
+    img[old_mask & ~new_mask] = (220, 50, 50)
+    img[new_mask & ~old_mask] = (40, 130, 230)
+    return img[::-1]   # glyph dùng +Y hướng lên
+
+def diff_glyph(name, old, new, res=128, tol=1.0, min_iou=0.98, max_disp=8.0, png_dir=None, frame=None):
+    po = glyph_polygons(old, tol); pn = glyph_polygons(new, tol)
+    x0, y0, size = frame or common_frame(po, pn)
+    mo = [rasterize(p, res, size, y0, x0) for p in po]; mn = [rasterize(p, res, size, y0, x0) for p in pn]
+    go = np.zeros((res, res), dtype=bool); gn = go.copy()
+    for m in mo: go |= m
+    for m in mn: gn |= m
+    per = [iou(a, b) for a, b in zip(mo, mn)]
+    g_iou = iou(go, gn)
+    disp = median_disp(old, new)
+    reasons = []
+    if len(mo) != len(mn): reasons.append("stroke-count")
+    if g_iou < min_iou: reasons.append("glyph-iou")
+    if per and min(per) < min_iou: reasons.append("stroke-iou")
+    if disp is not None and disp > max_disp: reasons.append("displacement")
+    row = {"char": char_of(name, new), "file": name,
+           "strokes_old": len(mo), "strokes_new": len(mn),
+           "iou": round(g_iou, 4),
+           "min_stroke_iou": round(min(per), 4) if per else "",
+           "worst_stroke": int(np.argmin(per)) if per else "",
+           "max_disp": "" if disp is None else round(disp, 2),
+           "flagged": bool(reasons), "reason": ";".join(reasons)}
+    if reasons and png_dir:
+        stem = os.path.basename(name).rsplit(".", 1)[0]
+        write_png(os.path.join(png_dir, f"{stem}.png"), overlay(go, gn))
+    return row
+
+def diff_batch(batch, opts):
+    rows = []
+    for name, raw_old, raw_new in batch:
+        try:
+            old = json.loads(raw_old); new = json.loads(raw_new)
+        except ValueError as e:
+            rows.append({"char": char_of(name), "file": name, "flagged": True, "reason": f"json: {e}"})
+            continue
+        rows.append(diff_glyph(name, old, new, **opts))
+    return rows
+
+def pair_entries(old_src, new_src):
+    key = lambda n: os.path.basename(n)
+    old = {key(n): raw for n, raw in iter_entries(old_src)}
+    for n, raw in iter_entries(new_src):
+        k = key(n)
+        if k in old: yield k, old.pop(k), raw
+
+def run(old_src, new_src, workers=None, batch=64, **opts):
+    rows = []
+    if workers == 1:
+        for b in batched(pair_entries(old_src, new_src), batch): rows += diff_batch(b, opts)
+        return rows
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(diff_batch, b, opts) for b in batched(pair_entries(old_src, new_src), batch)]
+        for f in futs: rows += f.result()
+    return rows
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("old"); ap.add_argument("new")
+    ap.add_argument("-o","--output", default="glyph_diff.csv")
+    ap.add_argument("--res", type=int, default=128, help="Độ phân giải raster (pixel mỗi cạnh)")
+    ap.add_argument("--tol", type=float, default=1.0, help="Sai số làm phẳng outline (px hệ 1024)")
+    ap.add_argument("--min-iou", type=float, default=0.98)
+    ap.add_argument("--max-disp", type=float, default=8.0, help="Độ dịch median tối đa (px hệ 1024)")
+    ap.add_argument("--png-dir", default=None, help="Ghi overlay PNG cho glyph bị đánh dấu")
+    ap.add_argument("--frame", default=None,
+                    help="Khung raster cố định x0,y0,size (vd -124 cho y0 của hanzi-writer-data: 0,-124,1024); "
+                         "mặc định bao 0..1024 + bbox chung OLD/NEW")
+    ap.add_argument("--only-flagged", action="store_true")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--batch", type=int, default=64)
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    if args.png_dir: os.makedirs(args.png_dir, exist_ok=True)
+    rows=run(args.old,args.new,workers=args.workers,batch=args.batch,res=args.res,tol=args.tol,
+             min_iou=args.min_iou,max_disp=args.max_disp,png_dir=args.png_dir,
+             frame=tuple(float(v) for v in args.frame.split(",")) if args.frame else None)
+    n=len(rows); n_flag=sum(1 for r in rows if r.get("flagged"))
+    if args.only_flagged: rows=[r for r in rows if r.get("flagged")]
+    rows.sort(key=lambda r: r.get("iou", -1.0) if r.get("iou", "") != "" else -1.0)
+    if args.output.lower().endswith(".json"):
+        with open(args.output,"w",encoding="utf-8") as f:
+            json.dump(rows,f,ensure_ascii=False,indent=1)
+    else:
+        with open(args.output,"w",encoding="utf-8",newline="") as f:
+            w=csv.DictWriter(f,fieldnames=FIELDS,extrasaction="ignore"); w.writeheader(); w.writerows(rows)
+    print(f"[✓] {n} cặp glyph, {n_flag} bị đánh dấu -> {args.output} ({time.perf_counter()-t0:.2f}s)")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Đọc/ghi hàng loạt glyph (HanziWriter JSON, SVG nguồn) từ thư mục hoặc file .zip
+
+- iter_entries(src): duyệt (tên, bytes) — thư mục (đệ quy), file .zip, hoặc 1 file lẻ
+- char_of(name, data): lấy ký tự từ "character", nếu trống thì lấy từ tên file
+- batched(it, n): gom thành lô để gửi cho process pool
+- GlyphSink(dst): ghi hàng loạt vào .zip (stored/deflated) hoặc thư mục; tên member tuyệt đối
+  hoặc có ".." (zip độc hại) bị từ chối bằng ValueError, không ghi ra ngoài dst
+Không giải nén ra đĩa: member zip được đọc/ghi trực tiếp qua zipfile.
+"""
+
+import os, zipfile
+from itertools import islice
+from urllib.parse import unquote
+
+def is_zip(path: str) -> bool:
+    return os.path.isfile(path) and path.lower().endswith(".zip")
+
+def member_name(info):
+    # zip tạo bởi công cụ cũ không bật cờ UTF-8 -> zipfile giải mã cp437, cần giải mã lại
+    if info.flag_bits & 0x800: return info.filename
+    try: return info.filename.encode("cp437").decode("utf-8")
+    except UnicodeError: return info.filename
+
+def iter_entries(src, suffix=".json"):
+    suf = suffix.lower()
+    if is_zip(src):
+        with zipfile.ZipFile(src) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(suf): continue
+                yield member_name(info), zf.read(info)
+        return
+    if os.path.isfile(src):
+        with open(src, "rb") as f:
+            yield src, f.read()
+        return
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames.sort()
+        for fn in sorted(filenames):
+            if not fn.lower().endswith(suf): continue
+            p = os.path.join(dirpath, fn)
+            with open(p, "rb") as f:
+                yield p, f.read()
+
+def char_of(name: str, data=None) -> str:
+    ch = (data or {}).get("character") if isinstance(data, dict) else None
+    if ch: return ch
+    stem = os.path.basename(name).rsplit(".", 1)[0]
+    return unquote(stem)
+
+def batched(it, n):
+    it = iter(it)
+    while True:
+        chunk = list(islice(it, n))
+        if not chunk: return
+        yield chunk
+
+COMPRESSION = {"stored": zipfile.ZIP_STORED, "deflated": zipfile.ZIP_DEFLATED}
+
+def safe_name(name):
+    """Tên member tương đối, dùng '/' -> ValueError nếu tuyệt đối hoặc có thành phần '..'"""
+    n = name.replace("\\", "/")
+    if n.startswith("/") or (len(n) > 1 and n[1] == ":"):
+        raise ValueError(f"tên member tuyệt đối: {name!r}")
+    parts = [c for c in n.split("/") if c not in ("", ".")]
+    if not parts or ".." in parts:
+        raise ValueError(f"tên member không hợp lệ: {name!r}")
+    return "/".join(parts)
+
+class GlyphSink:
+    """Đích ghi hàng loạt: file .zip (1 file handle, stored/deflated) hoặc thư mục."""
+    def __init__(self, dst, compression="deflated", level=None):
+        self.dst = dst; self.count = 0
+        if dst.lower().endswith(".zip"):
+            self.zf = zipfile.ZipFile(dst, "w", compression=COMPRESSION[compression], compresslevel=level)
+        else:
+            self.zf = None
+            os.makedirs(dst, exist_ok=True)
+
+    def write(self, name, data):
+        name = safe_name(name)
+        if isinstance(data, str): data = data.encode("utf-8")
+        if self.zf is not None:
+            self.zf.writestr(name, data)
+        else:
+            root = os.path.realpath(self.dst)
+            p = os.path.join(root, *name.split("/"))
+            if os.path.commonpath([root, os.path.realpath(p)]) != root:
+                raise ValueError(f"tên member trỏ ra ngoài thư mục đích: {name!r}")
+            os.makedirs(os.path.dirname(p) or ".", exist_ok=True)
+            with open(p, "wb") as f: f.write(data)
+        self.count += 1
+
+    def close(self):
+        if self.zf is not None: self.zf.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+def rel_name(src, name):
+    """Tên member tương đối so với nguồn (để giữ cấu trúc khi ghi ra đích)."""
+    if is_zip(src): return name
+    if os.path.isfile(src): return os.path.basename(name)
+    return os.path.relpath(name, src)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hàm hình học NumPy dùng chung cho các tool so sánh / tìm kiếm / chấm điểm glyph
+
+- outline_polygons(d, tol): path outline -> list mảng (N,2) (mỗi subpath 1 polygon)
+- rasterize(polys, res): tô polygon even-odd bằng NumPy -> mask bool (res, res)
+- resample(points, n): chia lại polyline thành n điểm cách đều theo độ dài
+- resample_batch(polys, n): như resample cho cả lô polyline (vector hoá)
+- write_png(path, rgb): ghi PNG RGB uint8 chỉ bằng zlib (không cần Pillow)
+
+Cần numpy: pip install numpy
+"""
+
+import zlib, struct
+import numpy as np
+
+from svg_to_hanzi_json import flatten_path, TARGET
+
+def outline_polygons(d, tol=1.0):
+    return [np.asarray(sub, dtype=np.float64) for sub in flatten_path(d, None, tol) if len(sub) >= 3]
+
+def rasterize(polys, res=128, size=TARGET, y0=0.0, x0=0.0):
+    """
+    Tô các polygon (khung vuông cạnh size, góc dưới-trái (x0, y0)) lên lưới res x res theo luật even-odd.
+    Mỗi cạnh cắt tâm hàng pixel -> +1 tại cột đầu tiên nằm bên phải giao điểm,
+    cumsum theo cột cho số lần cắt bên trái mỗi pixel; lẻ = bên trong.
+    """
+    mask = np.zeros((res, res), dtype=bool)
+    if not polys: return mask
+    a = np.concatenate([p for p in polys])
+    b = np.concatenate([np.roll(p, -1, axis=0) for p in polys])
+    k = res / size
+    xa = (a[:,0]-x0)*k; ya = (a[:,1]-y0)*k; xb = (b[:,0]-x0)*k; yb = (b[:,1]-y0)*k
+    yc = np.arange(res) + 0.5                                   # tâm các hàng
+    lo = np.minimum(ya, yb); hi = np.maximum(ya, yb)
+    hit = (yc[:,None] >= lo[None,:]) & (yc[:,None] < hi[None,:])  # (res, E)
+    rows, edges = np.nonzero(hit)
+    if rows.size == 0: return mask
+    t = (yc[rows] - ya[edges]) / (yb[edges] - ya[edges])
+    xi = xa[edges] + t*(xb[edges] - xa[edges])
+    cols = np.clip(np.floor(xi - 0.5).astype(np.int64) + 1, 0, res)
+    acc = np.zeros((res, res+1), dtype=np.int32)
+    np.add.at(acc, (rows, cols), 1)
+    return (np.cumsum(acc[:, :res], axis=1) & 1).astype(bool)
+
+def resample(points, n=32):
+    p = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    if len(p) == 0: return np.zeros((n, 2))
+    if len(p) == 1: return np.repeat(p, n, axis=0)
+    seg = np.hypot(*np.diff(p, axis=0).T)
+    s = np.concatenate([[0.0], np.cumsum(seg)])
+    if s[-1] <= 0: return np.repeat(p[:1], n, axis=0)
+    u = np.linspace(0.0, s[-1], n)
+    return np.stack([np.interp(u, s, p[:,0]), np.interp(u, s, p[:,1])], axis=1)
+
+def resample_batch(polys, n=32):
+    """
+    Resample cả lô polyline độ dài khác nhau -> (B, n, 2), không vòng lặp Python theo điểm.
+    Độ dài cung chuẩn hoá về [0,1] rồi cộng chỉ số hàng -> 1 dãy tăng dần, searchsorted 1 lần.
+    """
+    B = len(polys)
+    if B == 0: return np.zeros((0, n, 2))
+    lens = np.fromiter((len(p) for p in polys), dtype=np.int64, count=B)
+    P = np.concatenate([np.asarray(p, dtype=np.float64).reshape(-1, 2) for p in polys])
+    start = np.concatenate([[0], np.cumsum(lens)[:-1]])
+    seg = np.hypot(*np.diff(P, axis=0).T)
+    if B > 1: seg[start[1:] - 1] = 0.0   # không nối điểm cuối hàng trước với đầu hàng sau
+    acc = np.concatenate([[0.0], np.cumsum(seg)])
+    row = np.repeat(np.arange(B), lens)
+    s0 = acc[start]; total = acc[start + lens - 1] - s0
+    ok = total > 0
+    t = (acc - s0[row]) / np.where(ok, total, 1.0)[row]
+    key = row + t*(1 - 1e-9)
+    u = np.linspace(0.0, 1.0, n)*(1 - 1e-9)
+    q = (np.arange(B)[:, None] + u[None, :]).ravel()
+    hi = np.clip(np.searchsorted(key, q, side="left"), 1, len(key) - 1)
+    qrow = np.repeat(np.arange(B), n)
+    hi = np.clip(hi, start[qrow] + 1, start[qrow] + np.maximum(lens[qrow] - 1, 1))
+    lo = hi - 1
+    dk = key[hi] - key[lo]
+    w = np.where(dk > 0, (q - key[lo]) / np.where(dk > 0, dk, 1.0), 0.0)
+    out = P[lo] + (P[np.minimum(hi, start[qrow] + lens[qrow] - 1)] - P[lo]) * w[:, None]
+    out = out.reshape(B, n, 2)
+    bad = ~ok
+    if bad.any(): out[bad] = P[start[bad]][:, None, :]
+    return out
+
+def write_png(path, rgb):
+    rgb = np.ascontiguousarray(rgb, dtype=np.uint8)
+    h, w = rgb.shape[:2]
+    raw = np.concatenate([np.zeros((h, 1), dtype=np.uint8), rgb.reshape(h, w*3)], axis=1).tobytes()
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(chunk(b"IEND", b""))
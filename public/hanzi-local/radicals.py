@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tự động điền radStrokes bằng chỉ mục geometric-hash của bộ thủ
+
+- build: lấy nhóm stroke bộ thủ (radStrokes) từ glyph JSON có sẵn (hanzi-writer-data...),
+  chuẩn hoá median (resample, đưa về khung bộ thủ 0..1) -> lưu radical_index.json
+- Khoá hash = (số nét, hướng từng nét theo 8 hướng) -> tra bucket O(1), chỉ so chi tiết
+  trong bucket; nét gần ranh giới hướng được dò thêm bucket kề (multi-probe)
+- Mẫu gần trùng nhau được gộp (count) để chỉ mục gọn
+- apply: với mỗi glyph, thử các dãy nét liên tiếp -> radStrokes + độ tin cậy 0..1
+
+Ví dụ:
+  python radicals.py build node_modules/hanzi-writer-data -o radical_index.json
+  python radicals.py apply radical_index.json in_dir out.zip --report rad.csv
+  python svg_to_hanzi_json.py 亯.svg 亯.json --radicals radical_index.json
+"""
+
+import csv, json, math, time, argparse
+from itertools import product
+
+from glyph_io import iter_entries, char_of, rel_name, GlyphSink
+
+NPTS = 8
+DIR_MARGIN = math.radians(8)   # nét lệch < 8° so với ranh giới hướng -> dò thêm hướng kề
+MERGE_EPS = 0.03
+
+def resample_py(pts, n=NPTS):
+    if len(pts) == 1: return [tuple(pts[0])]*n
+    acc = [0.0]
+    for (ax,ay),(bx,by) in zip(pts, pts[1:]): acc.append(acc[-1] + math.hypot(bx-ax, by-ay))
+    L = acc[-1]
+    if L <= 0: return [tuple(pts[0])]*n
+    out = []; j = 0
+    for k in range(n):
+        s = L*k/(n-1)
+        while j < len(acc)-2 and acc[j+1] < s: j += 1
+        seg = acc[j+1]-acc[j]
+        t = 0.0 if seg <= 0 else (s-acc[j])/seg
+        (ax,ay),(bx,by) = pts[j], pts[j+1]
+        out.append((ax+(bx-ax)*t, ay+(by-ay)*t))
+    return out
+
+def bbox_pts(groups):
+    xs = [p[0] for g in groups for p in g]; ys = [p[1] for g in groups for p in g]
+    return min(xs), min(ys), max(xs), max(ys)
+
+def stroke_dirs(samples):
+    """-> mỗi nét 1 list hướng (0..7): phần tử đầu là hướng chính, thêm hướng kề nếu gần ranh giới."""
+    out = []
+    for pts in samples:
+        a = math.atan2(pts[-1][1]-pts[0][1], pts[-1][0]-pts[0][0]) % (2*math.pi)
+        f = a / (math.pi/4)
+        d = int(round(f)) % 8
+        opts = [d]
+        if abs((f - math.floor(f)) - 0.5) < DIR_MARGIN/(math.pi/4):
+            opts += [v % 8 for v in (math.floor(f), math.ceil(f)) if v % 8 != d]
+        out.append(opts)
+    return out
+
+def describe(medians, idxs, glyph_bb):
+    """Nhóm nét idxs -> (desc chuẩn hoá, region (x,y) trong glyph, size tương đối, dirs)."""
+    samples = [resample_py(medians[k]) for k in idxs]
+    x0,y0,x1,y1 = bbox_pts(samples)
+    s = max(x1-x0, y1-y0) or 1.0
+    desc = [v for pts in samples for (x,y) in pts for v in ((x-x0)/s, (y-y0)/s)]
+    gx0,gy0,gx1,gy1 = glyph_bb
+    gs = max(gx1-gx0, gy1-gy0) or 1.0
+    region = (((x0+x1)/2-gx0)/gs, ((y0+y1)/2-gy0)/gs)
+    return desc, region, s/gs, stroke_dirs(samples)
+
+def dist(a, b):
+    da, ra, sa = a; db, rb, sb = b
+    n = len(da)//2
+    pd = sum(math.hypot(da[2*k]-db[2*k], da[2*k+1]-db[2*k+1]) for k in range(n)) / n
+    return pd + 0.5*math.hypot(ra[0]-rb[0], ra[1]-rb[1]) + 0.5*abs(sa-sb)
+
+class RadicalIndex:
+    def __init__(self):
+        self.buckets = {}; self.sizes = set(); self.n = 0
+
+    @staticmethod
+    def keys(k, dirs):
+        for combo in product(*dirs):
+            yield f"{k}:" + "".join(map(str, combo))
+
+    def add(self, medians, rad, src=""):
+        if not rad or any(not 0 <= r < len(medians) or len(medians[r]) < 2 for r in rad): return
+        desc, region, size, dirs = describe(medians, sorted(rad), bbox_pts(medians))
+        # lưu theo hướng chính; lúc tra mới dò thêm hướng kề
+        key = f"{len(rad)}:" + "".join(str(d[0]) for d in dirs)
+        entry = (desc, region, size)
+        bucket = self.buckets.setdefault(key, [])
+        for e in bucket:
+            if dist(entry, (e["desc"], e["region"], e["size"])) < MERGE_EPS:
+                e["count"] += 1; return
+        bucket.append({"desc": [round(v, 4) for v in desc], "region": [round(v, 4) for v in region],
+                       "size": round(size, 4), "src": src, "count": 1})
+        self.sizes.add(len(rad)); self.n += 1
+
+    def match(self, medians, min_strokes=2, max_strokes=None):
+        """-> (radStrokes, confidence, src) tốt nhất hoặc None"""
+        n = len(medians)
+        if n < 2 or any(len(m) < 2 for m in medians): return None
+        gbb = bbox_pts(medians); best = None
+        for k in sorted(self.sizes):
+            if k < min_strokes or k >= n or (max_strokes and k > max_strokes): continue
+            for start in range(0, n-k+1):
+                idxs = list(range(start, start+k))
+                desc, region, size, dirs = describe(medians, idxs, gbb)
+                q = (desc, region, size)
+                for key in self.keys(k, dirs):
+                    for e in self.buckets.get(key, ()):
+                        d = dist(q, (e["desc"], e["region"], e["size"]))
+                        conf = math.exp(-d/0.12)
+                        # ưu tiên bộ thủ nhiều nét hơn khi độ tin cậy xấp xỉ
+                        score = conf * (1 + 0.02*k)
+                        if best is None or score > best[0]:
+                            best = (score, idxs, conf, e["src"])
+        return None if best is None else (best[1], round(best[2], 4), best[3])
+
+    def to_json(self):
+        return {"npts": NPTS, "buckets": self.buckets}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+        idx = cls(); idx.buckets = data["buckets"]
+        for key, b in idx.buckets.items():
+            idx.sizes.add(int(key.split(":")[0])); idx.n += len(b)
+        return idx
+
+def detect(data, index, min_conf=0.6, min_strokes=2):
+    """Glyph dict -> (radStrokes, confidence, src); radStrokes rỗng nếu dưới ngưỡng."""
+    m = index.match(data.get("medians") or [], min_strokes=min_strokes)
+    if not m or m[1] < min_conf: return [], (m[1] if m else 0.0), (m[2] if m else "")
+    return m
+
+def build(sources, out_path):
+    idx = RadicalIndex(); seen = 0
+    for src in sources:
+        for name, raw in iter_entries(src):
+            try: data = json.loads(raw)
+            except ValueError: continue
+            if not isinstance(data, dict): continue
+            rad = data.get("radStrokes") or []
+            if rad and len(rad) < len(data.get("strokes") or []):
+                idx.add(data.get("medians") or [], rad, char_of(name, data)); seen += 1
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(idx.to_json(), f, ensure_ascii=False, separators=(",",":"))
+    return seen, idx
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    sub=ap.add_subparsers(dest="cmd", required=True)
+    b=sub.add_parser("build"); b.add_argument("sources", nargs="+"); b.add_argument("-o","--output", default="radical_index.json")
+    a=sub.add_parser("apply"); a.add_argument("index"); a.add_argument("src"); a.add_argument("dst")
+    a.add_argument("--min-conf", type=float, default=0.6)
+    a.add_argument("--min-strokes", type=int, default=2)
+    a.add_argument("--keep", action="store_true", help="Giữ radStrokes sẵn có, chỉ điền glyph đang rỗng")
+    a.add_argument("--report", default=None, help="CSV: char, radStrokes, confidence, nguồn mẫu")
+    a.add_argument("--compression", choices=["stored","deflated"], default="deflated")
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    if args.cmd=="build":
+        seen,idx=build(args.sources,args.output)
+        print(f"[✓] {args.output}: {seen} glyph mẫu -> {idx.n} mẫu bộ thủ, {len(idx.buckets)} bucket "
+              f"({time.perf_counter()-t0:.2f}s)")
+    else:
+        idx=RadicalIndex.load(args.index); rows=[]; n_err=0
+        with GlyphSink(args.dst, args.compression) as sink:
+            for name, raw in iter_entries(args.src):
+                try:
+                    data=json.loads(raw)
+                    if not isinstance(data,dict): raise ValueError("gốc JSON phải là object")
+                    row=None
+                    if not (args.keep and data.get("radStrokes")):
+                        rad,conf,src=detect(data,idx,args.min_conf,args.min_strokes)
+                        data["radStrokes"]=list(rad)
+                        row={"char":char_of(name,data),"file":name,"radStrokes":" ".join(map(str,rad)),
+                             "confidence":conf,"match":src}
+                    sink.write(rel_name(args.src,name), json.dumps(data,ensure_ascii=False,separators=(",",":")))
+                except (ValueError, TypeError, IndexError, AttributeError) as e:
+                    print(f"[!] {name}: {e}"); n_err+=1; continue
+                if row is not None: rows.append(row)
+        if args.report:
+            with open(args.report,"w",encoding="utf-8",newline="") as f:
+                w=csv.DictWriter(f,fieldnames=["char","file","radStrokes","confidence","match"])
+                w.writeheader(); w.writerows(rows)
+        hit=sum(1 for r in rows if r["radStrokes"])
+        print(f"[✓] {args.dst}: {hit}/{len(rows)} glyph có radStrokes ({n_err} lỗi, {time.perf_counter()-t0:.2f}s)")
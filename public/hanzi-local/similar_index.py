@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chỉ mục chữ dễ nhầm (visually confusable) từ median + số nét
+
+- Mỗi glyph -> vector cố định (float16):
+  * median từng nét resample P điểm, chuẩn hoá theo bbox cả chữ (tối đa MAX_STROKES nét, thiếu thì 0)
+  * lưới mật độ GRIDxGRID của điểm median (không phụ thuộc thứ tự nét)
+  * số nét
+- Toàn bộ vector nằm trong 1 ma trận NumPy; top-k bằng tính khoảng cách theo lô
+  |q|² + |m|² - 2·q·Mᵀ rồi argpartition
+- Lưu dạng .npz nén: ma trận float16 + mã Unicode (uint32)
+
+Ví dụ:
+  python similar_index.py build node_modules/hanzi-writer-data . -o similar.npz
+  python similar_index.py query similar.npz 未末土士 -k 8
+  from similar_index import SimilarIndex; SimilarIndex.load("similar.npz").query("未", k=5)
+
+Cần numpy: pip install numpy
+"""
+
+import json, time, argparse
+import numpy as np
+
+from glyph_io import iter_entries, char_of
+from glyph_np import resample
+
+P = 8
+MAX_STROKES = 24
+GRID = 8
+W_ORDER, W_GRID, W_COUNT = 1.0, 2.0, 4.0
+
+def glyph_vector(medians):
+    v = np.zeros(MAX_STROKES*P*2 + GRID*GRID + 1, dtype=np.float32)
+    meds = [m for m in medians if len(m) >= 1]
+    if not meds: return v
+    pts = [resample(m, P) for m in meds[:MAX_STROKES]]
+    allp = np.concatenate(pts)
+    lo = allp.min(axis=0); s = float(max(np.ptp(allp[:,0]), np.ptp(allp[:,1]))) or 1.0
+    norm = [(p - lo)/s for p in pts]
+    blk = np.concatenate(norm).ravel()
+    v[:blk.size] = W_ORDER * blk / np.sqrt(P)
+    g = np.clip((np.concatenate(norm)*GRID).astype(int), 0, GRID-1)
+    grid = np.zeros((GRID, GRID), dtype=np.float32)
+    np.add.at(grid, (g[:,1], g[:,0]), 1.0)
+    v[MAX_STROKES*P*2:-1] = W_GRID * grid.ravel() / len(g)
+    v[-1] = W_COUNT * len(meds) / MAX_STROKES
+    return v
+
+class SimilarIndex:
+    def __init__(self, chars, vecs):
+        self.chars = list(chars)
+        self.vecs = np.asarray(vecs, dtype=np.float32)
+        self.norms = np.einsum("ij,ij->i", self.vecs, self.vecs)
+        self.pos = {c: k for k, c in enumerate(self.chars)}
+
+    @classmethod
+    def build(cls, sources):
+        chars = []; vecs = []
+        for src in sources:
+            for name, raw in iter_entries(src):
+                try: data = json.loads(raw)
+                except ValueError: continue
+                # khoá theo tên file như loadCharData ("character" trong file có thể lệch, vd 冃.json)
+                ch = char_of(name)
+                if len(ch) != 1 or not isinstance(data, dict): continue
+                chars.append(ch); vecs.append(glyph_vector(data.get("medians") or []))
+        # nguồn sau ghi đè nguồn trước (vd hanzi-local đè hanzi-writer-data)
+        last = {c: k for k, c in enumerate(chars)}
+        keep = sorted(last.values())
+        return cls([chars[k] for k in keep], np.stack([vecs[k] for k in keep]) if keep else
+                   np.zeros((0, MAX_STROKES*P*2 + GRID*GRID + 1), dtype=np.float32))
+
+    def save(self, path):
+        np.savez_compressed(path, vecs=self.vecs.astype(np.float16),
+                            chars=np.array([ord(c) for c in self.chars], dtype=np.uint32))
+
+    @classmethod
+    def load(cls, path):
+        z = np.load(path)
+        return cls([chr(int(c)) for c in z["chars"]], z["vecs"].astype(np.float32))
+
+    def query_vectors(self, Q, k=10, exclude=None, batch=1024):
+        """Q: (q, D) -> list[(chỉ số, khoảng cách)] cho từng hàng; exclude: chỉ số cần bỏ (chính nó)."""
+        Q = np.atleast_2d(np.asarray(Q, dtype=np.float32))
+        n = len(self.chars); k = min(k, n - (1 if exclude is not None else 0))
+        out = []
+        for b in range(0, len(Q), batch):
+            q = Q[b:b+batch]
+            d2 = np.einsum("ij,ij->i", q, q)[:,None] + self.norms[None,:] - 2.0*(q @ self.vecs.T)
+            if exclude is not None:
+                for r, ex in enumerate(exclude[b:b+batch]):
+                    if ex is not None and ex >= 0: d2[r, ex] = np.inf
+            if k <= 0:
+                out += [[] for _ in range(len(q))]; continue
+            part = np.argpartition(d2, k-1, axis=1)[:, :k]
+            pd = np.take_along_axis(d2, part, axis=1)
+            order = np.argsort(pd, axis=1)
+            part = np.take_along_axis(part, order, axis=1)
+            pd = np.sqrt(np.maximum(np.take_along_axis(pd, order, axis=1), 0.0))
+            out += [list(zip(r.tolist(), dd.tolist())) for r, dd in zip(part, pd)]
+        return out
+
+    def query(self, chars, k=10):
+        """chars: chuỗi/list ký tự có trong chỉ mục -> {ký tự: [(ký tự gần, khoảng cách), ...]}"""
+        chars = [c for c in chars if c in self.pos]
+        idx = [self.pos[c] for c in chars]
+        res = self.query_vectors(self.vecs[idx], k, exclude=idx)
+        return {c: [(self.chars[j], round(d, 4)) for j, d in r] for c, r in zip(chars, res)}
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    sub=ap.add_subparsers(dest="cmd", required=True)
+    b=sub.add_parser("build"); b.add_argument("sources", nargs="+"); b.add_argument("-o","--output", default="similar.npz")
+    q=sub.add_parser("query"); q.add_argument("index"); q.add_argument("chars")
+    q.add_argument("-k", type=int, default=10); q.add_argument("--json", action="store_true")
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    if args.cmd=="build":
+        idx=SimilarIndex.build(args.sources); idx.save(args.output)
+        print(f"[✓] {args.output}: {len(idx.chars)} chữ, vector {idx.vecs.shape[1]} chiều "
+              f"({time.perf_counter()-t0:.2f}s)")
+    else:
+        idx=SimilarIndex.load(args.index)
+        res=idx.query(args.chars, args.k)
+        missing=[c for c in args.chars if c not in idx.pos]
+        if missing: print(f"[!] Không có trong chỉ mục: {''.join(missing)}")
+        if args.json: print(json.dumps(res, ensure_ascii=False))
+        else:
+            for c, r in res.items(): print(c, " ".join(f"{n}({d:.3f})" for n, d in r))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chấm điểm hàng loạt nét vẽ (log luyện tập từ ReviewMode) so với median của glyph
+
+Quy tắc gần giống quiz của HanziWriter (hệ toạ độ glyph 0..1024, +Y hướng lên):
+- avg_dist: khoảng cách trung bình từ điểm người vẽ tới median <= 350 · distMod · leniency
+  (distMod = 0.5 khi outline hiện hoặc không phải nét đầu, ngược lại 1)
+- start/end: đầu & cuối nét cách đầu & cuối median <= 250 · leniency
+- direction: cosine trung bình giữa các đoạn tương ứng (sau resample) > 0
+- shape: Fréchet rời rạc giữa 2 đường đã chuẩn hoá (trừ trọng tâm, chia bán kính RMS),
+  thử xoay ±π/16, <= 0.4 · leniency
+- length: (độ dài nét + 25) / (độ dài median + 25) · leniency >= 0.35
+Mọi phép tính đều vector hoá NumPy theo lô (B nét một lúc), chia lô cho nhiều process.
+
+Input: JSONL, mỗi dòng {"char": "亯", "stroke": 3, "points": [[x,y],...], ...các trường khác giữ nguyên}
+Median tham chiếu: thư mục / .zip glyph JSON (hanzi-local, hanzi-writer-data...), khoá theo tên file
+Dòng JSONL hỏng / không phải object -> báo stderr và bỏ qua; points sai dạng -> "error" trong kết quả
+
+Ví dụ:
+  python stroke_score.py attempts.jsonl node_modules/hanzi-writer-data . -o scored.jsonl
+
+Cần numpy: pip install numpy
+"""
+
+import sys, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from glyph_io import iter_entries, char_of, batched
+from glyph_np import resample_batch
+
+N = 24
+AVG_DIST = 350.0
+START_END = 250.0
+FRECHET = 0.4
+MIN_LEN = 0.35
+ROTATIONS = (-np.pi/16, 0.0, np.pi/16)
+
+def poly_len(P):
+    return np.hypot(*np.diff(P, axis=1).transpose(2, 0, 1)).sum(axis=1)
+
+def normalize(P):
+    c = P - P.mean(axis=1, keepdims=True)
+    r = np.sqrt((c**2).sum(axis=2).mean(axis=1))
+    return c / np.maximum(r, 1e-9)[:, None, None]
+
+def frechet(A, B):
+    """Fréchet rời rạc cho cả lô: A, B (batch, n, 2) -> (batch,); quy hoạch động theo đường chéo phụ."""
+    d = np.sqrt(((A[:, :, None, :] - B[:, None, :, :])**2).sum(axis=3)).transpose(1, 2, 0)
+    n, m, nb = d.shape
+    ca = np.full((n+1, m+1, nb), np.inf)
+    ca[0, 0] = -np.inf
+    for k in range(n + m - 1):
+        i = np.arange(max(0, k-m+1), min(k, n-1) + 1); j = k - i
+        best = np.minimum(np.minimum(ca[i, j+1], ca[i, j]), ca[i+1, j])
+        ca[i+1, j+1] = np.maximum(best, d[i, j])
+    return ca[n, m]
+
+def score_strokes(users, refs, leniency=1.0, outline_visible=True, stroke_nums=None, n=N):
+    """
+    users, refs: list polyline (list [x,y]) cùng độ dài -> dict các mảng (B,):
+    avg_dist, start_dist, end_dist, cosine, frechet, len_ratio, ok_*, passed, score (0..1)
+    """
+    U = resample_batch(users, n); R = resample_batch(refs, n)
+    Rd = resample_batch(refs, n*2)                       # median dày hơn cho avg_dist
+    B = len(U)
+    nums = np.zeros(B, dtype=int) if stroke_nums is None else np.asarray(stroke_nums)
+    dist_mod = np.where(outline_visible | (nums > 0), 0.5, 1.0)
+
+    avg = np.sqrt(((U[:, :, None, :] - Rd[:, None, :, :])**2).sum(axis=3).min(axis=2)).mean(axis=1)
+    sd = np.hypot(*(U[:, 0] - R[:, 0]).T); ed = np.hypot(*(U[:, -1] - R[:, -1]).T)
+    du = np.diff(U, axis=1); dr = np.diff(R, axis=1)
+    nu = np.linalg.norm(du, axis=2); nr = np.linalg.norm(dr, axis=2)
+    cos = ((du*dr).sum(axis=2) / np.maximum(nu*nr, 1e-9)).mean(axis=1)
+    Un = normalize(U); Rn = normalize(R)
+    fr = np.full(B, np.inf)
+    for a in ROTATIONS:
+        c, s = np.cos(a), np.sin(a)
+        rot = Un @ np.array([[c, s], [-s, c]])
+        fr = np.minimum(fr, frechet(rot, Rn))
+    lr = (poly_len(U) + 25.0) / (poly_len(R) + 25.0)
+
+    ok_dist = avg <= AVG_DIST * dist_mod * leniency
+    ok_se = (sd <= START_END * leniency) & (ed <= START_END * leniency)
+    ok_dir = cos > 0
+    ok_shape = fr <= FRECHET * leniency
+    ok_len = lr * leniency >= MIN_LEN
+    passed = ok_dist & ok_se & ok_dir & ok_shape & ok_len
+    score = np.clip(1 - avg/(AVG_DIST*dist_mod*leniency), 0, 1) * 0.4 \
+          + np.clip((cos + 1)/2, 0, 1) * 0.2 + np.clip(1 - fr/(FRECHET*leniency*2), 0, 1) * 0.4
+    return {"avg_dist": avg, "start_dist": sd, "end_dist": ed, "cosine": cos, "frechet": fr,
+            "len_ratio": lr, "ok_dist": ok_dist, "ok_start_end": ok_se, "ok_direction": ok_dir,
+            "ok_shape": ok_shape, "ok_length": ok_len, "passed": passed, "score": score}
+
+def stroke_index(rec):
+    """Chỉ số nét hoặc None nếu "stroke" thiếu / không phải số nguyên"""
+    v = rec.get("stroke")
+    if isinstance(v, bool): return None
+    try: return int(v) if float(v) == int(v) else None
+    except (TypeError, ValueError, OverflowError): return None
+
+def as_polyline(pts):
+    """points -> mảng (n,2) float hữu hạn với n >= 2, hoặc None nếu sai dạng"""
+    try: P = np.asarray(pts, dtype=np.float64)
+    except (TypeError, ValueError): return None
+    if P.ndim != 2 or P.shape[1] != 2 or len(P) < 2 or not np.isfinite(P).all(): return None
+    return P
+
+def score_batch(batch, leniency, outline_visible):
+    """batch: list (record, median) -> list record đã gắn kết quả (giữ nguyên thứ tự)"""
+    out = []; pts = []
+    for rec, med in batch:
+        r = dict(rec); r.pop("points", None); P = as_polyline(rec.get("points"))
+        if stroke_index(rec) is None: r["error"] = f"stroke không hợp lệ: {rec.get('stroke')!r}"
+        elif med is None: r["error"] = "không có median tham chiếu"
+        elif P is None: r["error"] = "points phải là mảng (n,2) số hữu hạn, n >= 2"
+        if "error" in r: r["passed"] = False
+        out.append(r); pts.append(P)
+    good = [k for k, r in enumerate(out) if "error" not in r]
+    if good:
+        res = score_strokes([pts[k] for k in good], [batch[k][1] for k in good], leniency,
+                            outline_visible, [stroke_index(batch[k][0]) for k in good])
+        for key, arr in res.items():
+            vals = arr.tolist() if arr.dtype == bool else np.round(arr, 4).tolist()
+            for k, v in zip(good, vals): out[k][key] = v
+    return out
+
+def load_medians(sources):
+    meds = {}
+    for src in sources:
+        for name, raw in iter_entries(src):
+            try: data = json.loads(raw)
+            except ValueError: continue
+            # theo tên file như loadCharData: "character" trong file có thể lệch (vd 冃.json)
+            if isinstance(data, dict): meds[char_of(name)] = data.get("medians") or []
+    return meds
+
+def run(attempts, ref_sources, workers=None, batch=2048, leniency=1.0, outline_visible=True):
+    meds = load_medians(ref_sources)
+    def pairs():
+        for rec in attempts:
+            m = meds.get(rec.get("char"), [])
+            k = stroke_index(rec)
+            yield rec, (as_polyline(m[k]) if k is not None and 0 <= k < len(m) else None)
+    if workers == 1:
+        for b in batched(pairs(), batch): yield from score_batch(b, leniency, outline_visible)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(score_batch, b, leniency, outline_visible) for b in batched(pairs(), batch)]
+        for f in futs: yield from f.result()
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("attempts", help="JSONL các nét đã vẽ ('-' = stdin)")
+    ap.add_argument("refs", nargs="+", help="Thư mục / .zip glyph JSON tham chiếu")
+    ap.add_argument("-o","--output", default=None, help="JSONL kết quả (mặc định stdout)")
+    ap.add_argument("--leniency", type=float, default=1.0)
+    ap.add_argument("--no-outline", action="store_true", help="Outline ẩn khi luyện (siết avg_dist nét đầu)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--batch", type=int, default=2048)
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    fin=sys.stdin if args.attempts=="-" else open(args.attempts,"r",encoding="utf-8")
+    def read_attempts():
+        for no, line in enumerate(fin, 1):
+            if not line.strip(): continue
+            try: rec=json.loads(line)
+            except ValueError as e:
+                print(f"[!] dòng {no}: JSON lỗi ({e}), bỏ qua", file=sys.stderr); continue
+            if not isinstance(rec,dict):
+                print(f"[!] dòng {no}: không phải object, bỏ qua", file=sys.stderr); continue
+            yield rec
+    attempts=read_attempts()
+    fout=open(args.output,"w",encoding="utf-8") if args.output else sys.stdout
+    n=n_pass=0
+    for r in run(attempts,args.refs,workers=args.workers,batch=args.batch,
+                 leniency=args.leniency,outline_visible=not args.no_outline):
+        fout.write(json.dumps(r,ensure_ascii=False)+"\n"); n+=1; n_pass+=bool(r.get("passed"))
+    if args.output: fout.close()
+    dt=time.perf_counter()-t0
+    print(f"[✓] {n} nét, {n_pass} đạt ({dt:.2f}s, {n/max(dt,1e-9):.0f} nét/s)", file=sys.stderr)
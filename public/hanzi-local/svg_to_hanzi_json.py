@@ -9,12 +9,22 @@ SVG (Inkscape) -> JSON cho HanziWriter
 - Hỗ trợ A (arc) khi flip Y: đảo sweep-flag, âm rotation
 - Đọc g#layer-strokes (bắt buộc) + g#layer-medians (tuỳ chọn)
 - Median parser không treo: luôn bỏ qua tham số lệnh không hỗ trợ
-- Tuỳ chọn: --no-medians / --center / --verbose
+- Median cong (C/S/Q/T/A) được làm phẳng thích ứng theo --median-tol
+- Input/output có thể là thư mục hoặc .zip (chạy hàng loạt, --compression stored|deflated)
+- Tự điền radStrokes khi có --radicals radical_index.json (xem radicals.py)
+- --quad-tol: đổi cubic (C/S) sang ít Q nhất trong sai số cho phép (cùng kiểu đoạn với
+  hanzi-writer-data; chạy sau --center), in số đoạn, sai số đạt được và số ký tự so với path
+  cubic làm tròn cùng --quad-digits (Q thường dài hơn vì 1 cubic ≈ 2 quad)
+- Tuỳ chọn: --no-medians / --center / --median-tol / --radicals / --quad-tol / --verbose
 """
 
-import re, json, time, argparse
+import os, re, math, time, argparse
 import xml.etree.ElementTree as ET
 
+from glyph import Glyph
+from glyph_io import iter_entries, is_zip, rel_name, GlyphSink
+from radicals import RadicalIndex, detect as detect_radical
+
 NS = {
     "svg": "http://www.w3.org/2000/svg",
     "inkscape": "http://www.inkscape.org/namespaces/inkscape",
@@ -176,12 +186,143 @@ def path_to_abs_flipped_fast(d, minx, miny, sx, sy):
         prev=cmd
     return " ".join(out)
 
-def extract_medians_recursive(node, minx, miny, sx, sy, out):
+def _dist_to_chord(p, a, b):
+    dx=b[0]-a[0]; dy=b[1]-a[1]
+    L=(dx*dx+dy*dy)**0.5
+    if L < 1e-12: return ((p[0]-a[0])**2+(p[1]-a[1])**2)**0.5
+    return abs((p[0]-a[0])*dy-(p[1]-a[1])*dx)/L
+
+def flatten_cubic(p0, p1, p2, p3, tol, out, depth=0):
+    """Chia đôi (de Casteljau) tới khi control points cách dây cung <= tol; chỉ append điểm cuối."""
+    if depth >= 16 or max(_dist_to_chord(p1,p0,p3), _dist_to_chord(p2,p0,p3)) <= tol:
+        out.append([p3[0],p3[1]]); return
+    m = lambda a,b: ((a[0]+b[0])/2, (a[1]+b[1])/2)
+    p01=m(p0,p1); p12=m(p1,p2); p23=m(p2,p3)
+    p012=m(p01,p12); p123=m(p12,p23); mid=m(p012,p123)
+    flatten_cubic(p0,p01,p012,mid,tol,out,depth+1)
+    flatten_cubic(mid,p123,p23,p3,tol,out,depth+1)
+
+def flatten_quad(p0, p1, p2, tol, out, depth=0):
+    # sai số lớn nhất của Q so với dây cung = 1/2 khoảng cách control point
+    if depth >= 16 or _dist_to_chord(p1,p0,p2)/2 <= tol:
+        out.append([p2[0],p2[1]]); return
+    m = lambda a,b: ((a[0]+b[0])/2, (a[1]+b[1])/2)
+    p01=m(p0,p1); p12=m(p1,p2); mid=m(p01,p12)
+    flatten_quad(p0,p01,mid,tol,out,depth+1)
+    flatten_quad(mid,p12,p2,tol,out,depth+1)
+
+def arc_points(x1, y1, rx, ry, rot_deg, laf, swf, x2, y2, tol):
+    """SVG arc (endpoint) -> các điểm sau điểm đầu; số đoạn theo sai số dây cung <= tol."""
+    rx=abs(rx); ry=abs(ry)
+    if rx < 1e-12 or ry < 1e-12 or (x1==x2 and y1==y2): return [(x2,y2)]
+    phi=math.radians(rot_deg); cp=math.cos(phi); sp=math.sin(phi)
+    dx=(x1-x2)/2; dy=(y1-y2)/2
+    x1p=cp*dx+sp*dy; y1p=-sp*dx+cp*dy
+    lam=(x1p*x1p)/(rx*rx)+(y1p*y1p)/(ry*ry)
+    if lam > 1: r=lam**0.5; rx*=r; ry*=r
+    num=rx*rx*ry*ry - rx*rx*y1p*y1p - ry*ry*x1p*x1p
+    den=rx*rx*y1p*y1p + ry*ry*x1p*x1p
+    co=(max(0.0,num)/den)**0.5 if den > 0 else 0.0
+    if int(round(laf)) == int(round(swf)): co=-co
+    cxp=co*rx*y1p/ry; cyp=-co*ry*x1p/rx
+    ccx=cp*cxp-sp*cyp+(x1+x2)/2; ccy=sp*cxp+cp*cyp+(y1+y2)/2
+    ang=lambda ux,uy,vx,vy: math.atan2(ux*vy-uy*vx, ux*vx+uy*vy)
+    th1=ang(1,0,(x1p-cxp)/rx,(y1p-cyp)/ry)
+    dth=ang((x1p-cxp)/rx,(y1p-cyp)/ry,(-x1p-cxp)/rx,(-y1p-cyp)/ry)
+    if not int(round(swf)) and dth > 0: dth-=2*math.pi
+    elif int(round(swf)) and dth < 0: dth+=2*math.pi
+    r=max(rx,ry)
+    step=2*math.acos(max(-1.0,1-tol/r)) if tol < r else math.pi/2
+    n=max(1, int(math.ceil(abs(dth)/max(step,1e-3))))
+    pts=[]
+    for k in range(1,n+1):
+        t=th1+dth*k/n
+        ex=rx*math.cos(t); ey=ry*math.sin(t)
+        pts.append((cp*ex-sp*ey+ccx, sp*ex+cp*ey+ccy))
+    pts[-1]=(x2,y2)
+    return pts
+
+def flatten_path(d, tp=None, tol=1.0, scale=1.0):
+    """
+    Path bất kỳ -> danh sách polyline (mỗi M mở 1 subpath), toạ độ sau khi qua tp(x,y)
+    - M/L/H/V/Z: giữ nguyên điểm
+    - C/S/Q/T: làm phẳng thích ứng (đoạn thẳng ít điểm, chỗ cong gắt nhiều điểm)
+    - A: chia cung theo sai số dây cung
+    tol: sai số tối đa sau biến đổi; scale: hệ số phóng của tp (để quy đổi tol cho cung)
+    """
+    ts=tokens(d); n=len(ts); i=0; prev=None
+    cx=cy=None; sx0=sy0=None; last_c=last_q=None; seg=[]; subs=[]
+    tp=tp or (lambda x,y: (x,y))
+    def get(k):
+        nonlocal i
+        if i+k>n or any(is_cmd(ts[i+j]) for j in range(k)): return None
+        vals=[float(ts[i+j]) for j in range(k)]; i+=k; return vals
+    while i<n:
+        if is_cmd(ts[i]): cmd=ts[i]; i+=1
+        else:
+            if prev is None: break
+            cmd=prev
+        up=cmd.upper(); rel=cmd.islower()
+        if up!="M" and cx is None:
+            # lệnh vẽ khi chưa có điểm đầu: bỏ qua tham số
+            while i<n and not is_cmd(ts[i]): i+=1
+            prev=cmd; continue
+        ox,oy=(cx,cy) if rel and cx is not None else (0.0,0.0)
+        k={"M":2,"L":2,"T":2,"H":1,"V":1,"C":6,"S":4,"Q":4,"A":7,"Z":0}.get(up)
+        if k is None:
+            while i<n and not is_cmd(ts[i]): i+=1
+            prev=cmd; continue
+        if up=="Z":
+            if sx0 is not None and (cx,cy)!=(sx0,sy0): seg.append(list(tp(sx0,sy0)))
+            cx,cy=sx0,sy0; last_c=last_q=None; prev=cmd; continue
+        v=get(k)
+        if not v:
+            while i<n and not is_cmd(ts[i]): i+=1
+            prev=cmd; continue
+        if up=="M":
+            cx,cy=v[0]+ox,v[1]+oy; sx0,sy0=cx,cy
+            seg=[list(tp(cx,cy))]; subs.append(seg)
+            last_c=last_q=None; cmd="l" if rel else "L"
+        elif up in ("L","H","V"):
+            if up=="L": x,y=v[0]+ox,v[1]+oy
+            elif up=="H": x,y=v[0]+(cx if rel else 0.0),cy
+            else: x,y=cx,v[0]+(cy if rel else 0.0)
+            cx,cy=x,y; seg.append(list(tp(x,y))); last_c=last_q=None
+        elif up in ("C","S"):
+            if up=="C": x1,y1,x2,y2,x,y=v[0]+ox,v[1]+oy,v[2]+ox,v[3]+oy,v[4]+ox,v[5]+oy
+            else:
+                x2,y2,x,y=v[0]+ox,v[1]+oy,v[2]+ox,v[3]+oy
+                x1,y1=(2*cx-last_c[0],2*cy-last_c[1]) if last_c else (cx,cy)
+            flatten_cubic(tp(cx,cy),tp(x1,y1),tp(x2,y2),tp(x,y),tol,seg)
+            cx,cy=x,y; last_c=(x2,y2); last_q=None
+        elif up in ("Q","T"):
+            if up=="Q": x1,y1,x,y=v[0]+ox,v[1]+oy,v[2]+ox,v[3]+oy
+            else:
+                x,y=v[0]+ox,v[1]+oy
+                x1,y1=(2*cx-last_q[0],2*cy-last_q[1]) if last_q else (cx,cy)
+            flatten_quad(tp(cx,cy),tp(x1,y1),tp(x,y),tol,seg)
+            cx,cy=x,y; last_q=(x1,y1); last_c=None
+        elif up=="A":
+            rx,ry,rot,laf,swf,x,y=v; x+=ox; y+=oy
+            for px,py in arc_points(cx,cy,rx,ry,rot,laf,swf,x,y,tol/max(scale,1e-12)):
+                seg.append(list(tp(px,py)))
+            cx,cy=x,y; last_c=last_q=None
+        prev=cmd
+    return subs
+
+def median_path_points(d, minx, miny, sx, sy, tol=1.0):
+    """Median <path> -> 1 polyline trong hệ 1024 (đã lật Y), tol: sai số tối đa (pixel hệ 1024)"""
+    # tol <= 0 -> mọi đường cong bị chia tới độ sâu 16 (65537 điểm / 1 lệnh C)
+    if not tol > 0: raise ValueError(f"median tol phải > 0, gặp {tol}")
+    tp=lambda x,y: transform_point(x,y,minx,miny,sx,sy)
+    return [pt for sub in flatten_path(d, tp, tol, max(sx,sy)) for pt in sub]
+
+def extract_medians_recursive(node, minx, miny, sx, sy, out, tol=1.0):
     for el in list(node):
         tag = (el.tag.split("}",1)[-1] if isinstance(el.tag,str) else "")
         t = tag.lower()
         if t == "g":
-            extract_medians_recursive(el, minx, miny, sx, sy, out); continue
+            extract_medians_recursive(el, minx, miny, sx, sy, out, tol); continue
         if t == "line":
             try:
                 x1=float(el.attrib.get("x1","0")); y1=float(el.attrib.get("y1","0"))
@@ -200,37 +341,264 @@ def extract_medians_recursive(node, minx, miny, sx, sy, out):
             if seg: out.append(seg)
             continue
         if t == "path":
-            d = el.attrib.get("d","") or ""
-            ts=tokens(d); i=0; n=len(ts); prev=None; cx=cy=None; seg=[]
-            def get2():
-                nonlocal i
-                if i+1<n and (not is_cmd(ts[i])) and (not is_cmd(ts[i+1])):
-                    x=float(ts[i]); y=float(ts[i+1]); i+=2; return x,y,True
-                return 0,0,False
-            while i<n:
-                if is_cmd(ts[i]): cmd=ts[i]; i+=1
-                else:
-                    if prev is None: break
-                    cmd=prev
-                up=cmd.upper(); rel=cmd.islower()
-                if up=="M":
-                    x,y,ok=get2()
-                    if not ok: break
-                    if rel and cx is not None and cy is not None: x+=cx; y+=cy
-                    cx,cy=x,y; X,Y=transform_point(x,y,minx,miny,sx,sy); seg.append([X,Y])
-                elif up=="L":
-                    x,y,ok=get2()
-                    if not ok: break
-                    if rel and cx is not None and cy is not None: x+=cx; y+=cy
-                    cx,cy=x,y; X,Y=transform_point(x,y,minx,miny,sx,sy); seg.append([X,Y])
-                else:
-                    # QUAN TRỌNG: bỏ qua toàn bộ tham số của lệnh không hỗ trợ
-                    while i<n and not is_cmd(ts[i]): i+=1
-                prev=cmd
+            seg = median_path_points(el.attrib.get("d","") or "", minx, miny, sx, sy, tol)
             if seg: out.append(seg)
             continue
         # phần tử khác: bỏ qua
 
+def cubic_point(p0, p1, p2, p3, t):
+    u = 1 - t
+    x = (u**3)*p0[0] + 3*(u*u)*t*p1[0] + 3*u*(t*t)*p2[0] + (t**3)*p3[0]
+    y = (u**3)*p0[1] + 3*(u*u)*t*p1[1] + 3*u*(t*t)*p2[1] + (t**3)*p3[1]
+    return (x, y)
+
+def quad_point(p0, p1, p2, t):
+    u = 1 - t
+    x = (u*u)*p0[0] + 2*u*t*p1[0] + (t*t)*p2[0]
+    y = (u*u)*p0[1] + 2*u*t*p1[1] + (t*t)*p2[1]
+    return (x, y)
+
+def cubic_extrema_t(p0, p1, p2, p3):
+    # B'(t) = 3*(1-t)^2*(p1-p0) + 6*(1-t)*t*(p2-p1) + 3*t^2*(p3-p2)
+    # Cho từng toạ độ ta có đa thức bậc 2: a t^2 + b t + c = 0
+    ts = set([0.0, 1.0])
+    for dim in (0, 1):
+        p0d, p1d, p2d, p3d = p0[dim], p1[dim], p2[dim], p3[dim]
+        a = -p0d + 3*p1d - 3*p2d + p3d
+        b =  2*(p0d - 2*p1d + p2d)
+        c =  (p1d - p0d)
+        # 3*(a t^2 + b t + c) = 0  ->  a t^2 + b t + c = 0
+        disc = b*b - 4*a*c
+        if abs(a) < 1e-12:
+            if abs(b) > 1e-12:
+                t = -c / b
+                if 0 < t < 1: ts.add(t)
+        elif disc >= 0:
+            r = disc**0.5
+            t1 = (-b - r) / (2*a)
+            t2 = (-b + r) / (2*a)
+            if 0 < t1 < 1: ts.add(t1)
+            if 0 < t2 < 1: ts.add(t2)
+    return sorted(ts)
+
+def quad_extrema_t(p0, p1, p2):
+    ts = set([0.0, 1.0])
+    for dim in (0, 1):
+        p0d, p1d, p2d = p0[dim], p1[dim], p2[dim]
+        denom = (p0d - 2*p1d + p2d)
+        if abs(denom) > 1e-12:
+            t = (p0d - p1d) / denom
+            if 0 < t < 1: ts.add(t)
+    return sorted(ts)
+
+def bbox_of_d(d):
+    ts = tokens(d)
+    n = len(ts); i = 0
+    prev = None
+    cx = cy = None
+    last_c_ctrl = None
+    last_q_ctrl = None
+
+    xs, ys = [], []
+
+    def take(k):
+        nonlocal i
+        vals = [float(ts[i+j]) for j in range(k)]
+        i += k
+        return vals
+
+    while i < n:
+        if is_cmd(ts[i]): cmd = ts[i]; i += 1
+        else: cmd = prev
+        up = cmd.upper()
+
+        if up == "M":
+            x, y = take(2); cx, cy = x, y
+            xs.append(x); ys.append(y)
+            last_c_ctrl = last_q_ctrl = None
+
+        elif up == "L":
+            x, y = take(2)
+            xs += [cx, x]; ys += [cy, y]
+            cx, cy = x, y
+            last_c_ctrl = last_q_ctrl = None
+
+        elif up == "H":
+            (x,) = take(1)
+            xs += [cx, x]; ys += [cy, cy]
+            cx = x; last_c_ctrl = last_q_ctrl = None
+
+        elif up == "V":
+            (y,) = take(1)
+            xs += [cx, cx]; ys += [cy, y]
+            cy = y; last_c_ctrl = last_q_ctrl = None
+
+        elif up == "C":
+            x1, y1, x2, y2, x, y = take(6)
+            p0 = (cx, cy); p1 = (x1, y1); p2 = (x2, y2); p3 = (x, y)
+            for t in cubic_extrema_t(p0, p1, p2, p3):
+                px, py = cubic_point(p0, p1, p2, p3, t)
+                xs.append(px); ys.append(py)
+            cx, cy = x, y
+            last_c_ctrl = (x2, y2); last_q_ctrl = None
+
+        elif up == "S":
+            x2, y2, x, y = take(4)
+            if last_c_ctrl is not None:
+                x1 = 2*cx - last_c_ctrl[0]
+                y1 = 2*cy - last_c_ctrl[1]
+            else:
+                x1, y1 = cx, cy
+            p0 = (cx, cy); p1 = (x1, y1); p2 = (x2, y2); p3 = (x, y)
+            for t in cubic_extrema_t(p0, p1, p2, p3):
+                px, py = cubic_point(p0, p1, p2, p3, t)
+                xs.append(px); ys.append(py)
+            cx, cy = x, y
+            last_c_ctrl = (x2, y2); last_q_ctrl = None
+
+        elif up == "Q":
+            x1, y1, x, y = take(4)
+            p0 = (cx, cy); p1 = (x1, y1); p2 = (x, y)
+            for t in quad_extrema_t(p0, p1, p2):
+                px, py = quad_point(p0, p1, p2, t)
+                xs.append(px); ys.append(py)
+            cx, cy = x, y
+            last_q_ctrl = (x1, y1); last_c_ctrl = None
+
+        elif up == "T":
+            x, y = take(2)
+            if last_q_ctrl is not None:
+                x1 = 2*cx - last_q_ctrl[0]
+                y1 = 2*cy - last_q_ctrl[1]
+            else:
+                x1, y1 = cx, cy
+            p0 = (cx, cy); p1 = (x1, y1); p2 = (x, y)
+            for t in quad_extrema_t(p0, p1, p2):
+                px, py = quad_point(p0, p1, p2, t)
+                xs.append(px); ys.append(py)
+            cx, cy = x, y
+            last_q_ctrl = (x1, y1); last_c_ctrl = None
+
+        elif up == "A":
+            # dùng 2 đầu mút
+            rx, ry, rot, laf, swf, x, y = take(7)
+            xs += [cx, x]; ys += [cy, y]
+            cx, cy = x, y
+            last_c_ctrl = last_q_ctrl = None
+
+        elif up == "Z":
+            last_c_ctrl = last_q_ctrl = None
+
+        prev = cmd
+
+    if not xs or not ys:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+MAX_QUADS = 16
+
+def split_cubic(p0, p1, p2, p3, t0, t1):
+    """Đoạn [t0,t1] của cubic -> 4 control point mới (đạo hàm tại 2 đầu nhân (t1-t0))."""
+    def deriv(t):
+        u = 1 - t
+        return (3*(u*u*(p1[0]-p0[0]) + 2*u*t*(p2[0]-p1[0]) + t*t*(p3[0]-p2[0])),
+                3*(u*u*(p1[1]-p0[1]) + 2*u*t*(p2[1]-p1[1]) + t*t*(p3[1]-p2[1])))
+    a = cubic_point(p0, p1, p2, p3, t0); b = cubic_point(p0, p1, p2, p3, t1)
+    da = deriv(t0); db = deriv(t1); k = (t1-t0)/3
+    return a, (a[0]+k*da[0], a[1]+k*da[1]), (b[0]-k*db[0], b[1]-k*db[1]), b
+
+def quad_error(p0, p1, p2, p3, q1, steps=16):
+    """Sai số lớn nhất giữa cubic và Q(p0,q1,p3): hiệu 2 đường là cubic có 2 đầu = 0."""
+    d1 = (p1[0]-(p0[0]+2*q1[0])/3, p1[1]-(p0[1]+2*q1[1])/3)
+    d2 = (p2[0]-(2*q1[0]+p3[0])/3, p2[1]-(2*q1[1]+p3[1])/3)
+    err = 0.0
+    for k in range(1, steps):
+        t = k/steps; u = 1 - t; a = 3*u*u*t; b = 3*u*t*t
+        err = max(err, math.hypot(a*d1[0]+b*d2[0], a*d1[1]+b*d2[1]))
+    return err
+
+def cubic_to_quads(p0, p1, p2, p3, tol=1.0, max_n=MAX_QUADS):
+    """
+    Cubic -> ít Q nhất (chia đều n = 1, 2, ... đoạn) sao cho sai số <= tol
+    -> ([(q1, q2), ...], sai số đạt được); control của mỗi Q = (3(c1+c2) - (c0+c3))/4
+    """
+    for n in range(1, max_n+1):
+        quads = []; err = 0.0
+        for k in range(n):
+            c0, c1, c2, c3 = (p0, p1, p2, p3) if n == 1 else split_cubic(p0, p1, p2, p3, k/n, (k+1)/n)
+            q1 = ((3*(c1[0]+c2[0]) - c0[0] - c3[0])/4, (3*(c1[1]+c2[1]) - c0[1] - c3[1])/4)
+            err = max(err, quad_error(c0, c1, c2, c3, q1))
+            if err > tol and n < max_n: break
+            quads.append((q1, c3))
+        else:
+            return quads, err
+
+def path_to_quads(d, tol=1.0, digits=None):
+    """
+    Path tuyệt đối (đầu ra path_to_abs_flipped_fast) -> (path chỉ còn M/L/Q/A/Z, thống kê)
+    - C/S -> Q theo cubic_to_quads; T -> Q tường minh (vì lệnh trước có thể đã đổi từ C sang Q)
+    - digits: làm tròn toạ độ (vd 1); sai số làm tròn được trừ vào tol và cộng vào max_err
+    thống kê: {"cubics", "quads", "max_err", "before", "after"} (before/after = số ký tự;
+    before = path gốc làm tròn cùng digits, để chỉ đo riêng tác dụng của C -> Q)
+    """
+    ts = tokens(d); n = len(ts); i = 0; out = []
+    cx = cy = None; sx0 = sy0 = None; last_c = last_q = None; prev = None
+    def get(k):
+        nonlocal i
+        if i+k > n or any(is_cmd(ts[i+j]) for j in range(k)): return None
+        vals = [float(ts[i+j]) for j in range(k)]; i += k; return vals
+    if digits is None: f = trim_num; rnd = 0.0
+    else: f = lambda v: trim_num(round(v, digits) + 0.0); rnd = 0.5 * 10**-digits * math.sqrt(2)
+    if tol <= rnd: raise ValueError(f"tol={tol} phải lớn hơn sai số làm tròn {rnd:.3g} (digits={digits})")
+    before = len(re.sub(NUM_RE, lambda m: f(float(m.group())), d))
+    st = {"cubics": 0, "quads": 0, "max_err": 0.0, "before": before, "after": 0}
+    while i < n:
+        if is_cmd(ts[i]): cmd = ts[i]; i += 1
+        else:
+            if prev is None or prev.upper() == "Z":
+                raise ValueError(f"path_to_quads: số '{ts[i]}' không thuộc lệnh nào")
+            cmd = prev
+        up = cmd.upper(); prev = cmd
+        if cmd != up and up != "Z": raise ValueError(f"path_to_quads cần path tuyệt đối, gặp '{cmd}'")
+        if up not in "MZ" and cx is None: raise ValueError(f"path_to_quads: lệnh '{cmd}' trước M")
+        if up == "Z":
+            out.append("Z"); last_c = last_q = None
+            if sx0 is not None: cx, cy = sx0, sy0
+            continue
+        k = {"M":2, "L":2, "C":6, "S":4, "Q":4, "T":2, "A":7, "H":1, "V":1}.get(up)
+        if k is None: raise ValueError(f"path_to_quads: lệnh không hỗ trợ '{cmd}'")
+        vs = get(k)
+        if vs is None: raise ValueError(f"path_to_quads: lệnh '{cmd}' thiếu tham số")
+        if up == "M":
+            cx, cy = vs; sx0, sy0 = cx, cy; out.append(f"M {f(cx)} {f(cy)}"); last_c = last_q = None
+        elif up in ("L", "H", "V"):
+            if up == "L": cx, cy = vs
+            elif up == "H": cx = vs[0]
+            else: cy = vs[0]
+            out.append(f"L {f(cx)} {f(cy)}"); last_c = last_q = None
+        elif up in ("C", "S"):
+            if up == "C": c1 = (vs[0], vs[1]); c2 = (vs[2], vs[3]); end = (vs[4], vs[5])
+            else:
+                c1 = (2*cx-last_c[0], 2*cy-last_c[1]) if last_c else (cx, cy)
+                c2 = (vs[0], vs[1]); end = (vs[2], vs[3])
+            quads, err = cubic_to_quads((cx, cy), c1, c2, end, tol - rnd)
+            for q1, q2 in quads: out.append(f"Q {f(q1[0])} {f(q1[1])} {f(q2[0])} {f(q2[1])}")
+            st["cubics"] += 1; st["quads"] += len(quads); st["max_err"] = max(st["max_err"], err + rnd)
+            cx, cy = end; last_c = c2; last_q = None
+        elif up in ("Q", "T"):
+            if up == "Q": q1 = (vs[0], vs[1]); cx2, cy2 = vs[2], vs[3]
+            else:
+                q1 = (2*cx-last_q[0], 2*cy-last_q[1]) if last_q else (cx, cy)
+                cx2, cy2 = vs
+            out.append(f"Q {f(q1[0])} {f(q1[1])} {f(cx2)} {f(cy2)}")
+            cx, cy = cx2, cy2; last_q = q1; last_c = None
+        else:
+            rx, ry, rot, laf, swf, x, y = vs
+            out.append(f"A {f(rx)} {f(ry)} {f(rot)} {int(laf)} {int(swf)} {f(x)} {f(y)}")
+            cx, cy = x, y; last_c = last_q = None
+    res = " ".join(out); st["after"] = len(res)
+    return res, st
+
 def center_shapes(strokes, medians, fit=False, pad=0.0):
     """
     Căn giữa dựa trên bbox chính xác:
@@ -242,155 +610,6 @@ def center_shapes(strokes, medians, fit=False, pad=0.0):
     pad: đơn vị pixels trong hệ 1024
     """
 
-    def cubic_point(p0, p1, p2, p3, t):
-        u = 1 - t
-        x = (u**3)*p0[0] + 3*(u*u)*t*p1[0] + 3*u*(t*t)*p2[0] + (t**3)*p3[0]
-        y = (u**3)*p0[1] + 3*(u*u)*t*p1[1] + 3*u*(t*t)*p2[1] + (t**3)*p3[1]
-        return (x, y)
-
-    def quad_point(p0, p1, p2, t):
-        u = 1 - t
-        x = (u*u)*p0[0] + 2*u*t*p1[0] + (t*t)*p2[0]
-        y = (u*u)*p0[1] + 2*u*t*p1[1] + (t*t)*p2[1]
-        return (x, y)
-
-    def cubic_extrema_t(p0, p1, p2, p3):
-        # B'(t) = 3*(1-t)^2*(p1-p0) + 6*(1-t)*t*(p2-p1) + 3*t^2*(p3-p2)
-        # Cho từng toạ độ ta có đa thức bậc 2: a t^2 + b t + c = 0
-        ts = set([0.0, 1.0])
-        for dim in (0, 1):
-            p0d, p1d, p2d, p3d = p0[dim], p1[dim], p2[dim], p3[dim]
-            a = -p0d + 3*p1d - 3*p2d + p3d
-            b =  2*(p0d - 2*p1d + p2d)
-            c =  (p1d - p0d)
-            # 3*(a t^2 + b t + c) = 0  ->  a t^2 + b t + c = 0
-            disc = b*b - 4*a*c
-            if abs(a) < 1e-12:
-                if abs(b) > 1e-12:
-                    t = -c / b
-                    if 0 < t < 1: ts.add(t)
-            elif disc >= 0:
-                r = disc**0.5
-                t1 = (-b - r) / (2*a)
-                t2 = (-b + r) / (2*a)
-                if 0 < t1 < 1: ts.add(t1)
-                if 0 < t2 < 1: ts.add(t2)
-        return sorted(ts)
-
-    def quad_extrema_t(p0, p1, p2):
-        ts = set([0.0, 1.0])
-        for dim in (0, 1):
-            p0d, p1d, p2d = p0[dim], p1[dim], p2[dim]
-            denom = (p0d - 2*p1d + p2d)
-            if abs(denom) > 1e-12:
-                t = (p0d - p1d) / denom
-                if 0 < t < 1: ts.add(t)
-        return sorted(ts)
-
-    def bbox_of_d(d):
-        ts = tokens(d)
-        n = len(ts); i = 0
-        prev = None
-        cx = cy = None
-        last_c_ctrl = None
-        last_q_ctrl = None
-
-        xs, ys = [], []
-
-        def take(k):
-            nonlocal i
-            vals = [float(ts[i+j]) for j in range(k)]
-            i += k
-            return vals
-
-        while i < n:
-            if is_cmd(ts[i]): cmd = ts[i]; i += 1
-            else: cmd = prev
-            up = cmd.upper()
-
-            if up == "M":
-                x, y = take(2); cx, cy = x, y
-                xs.append(x); ys.append(y)
-                last_c_ctrl = last_q_ctrl = None
-
-            elif up == "L":
-                x, y = take(2)
-                xs += [cx, x]; ys += [cy, y]
-                cx, cy = x, y
-                last_c_ctrl = last_q_ctrl = None
-
-            elif up == "H":
-                (x,) = take(1)
-                xs += [cx, x]; ys += [cy, cy]
-                cx = x; last_c_ctrl = last_q_ctrl = None
-
-            elif up == "V":
-                (y,) = take(1)
-                xs += [cx, cx]; ys += [cy, y]
-                cy = y; last_c_ctrl = last_q_ctrl = None
-
-            elif up == "C":
-                x1, y1, x2, y2, x, y = take(6)
-                p0 = (cx, cy); p1 = (x1, y1); p2 = (x2, y2); p3 = (x, y)
-                for t in cubic_extrema_t(p0, p1, p2, p3):
-                    px, py = cubic_point(p0, p1, p2, p3, t)
-                    xs.append(px); ys.append(py)
-                cx, cy = x, y
-                last_c_ctrl = (x2, y2); last_q_ctrl = None
-
-            elif up == "S":
-                x2, y2, x, y = take(4)
-                if last_c_ctrl is not None:
-                    x1 = 2*cx - last_c_ctrl[0]
-                    y1 = 2*cy - last_c_ctrl[1]
-                else:
-                    x1, y1 = cx, cy
-                p0 = (cx, cy); p1 = (x1, y1); p2 = (x2, y2); p3 = (x, y)
-                for t in cubic_extrema_t(p0, p1, p2, p3):
-                    px, py = cubic_point(p0, p1, p2, p3, t)
-                    xs.append(px); ys.append(py)
-                cx, cy = x, y
-                last_c_ctrl = (x2, y2); last_q_ctrl = None
-
-            elif up == "Q":
-                x1, y1, x, y = take(4)
-                p0 = (cx, cy); p1 = (x1, y1); p2 = (x, y)
-                for t in quad_extrema_t(p0, p1, p2):
-                    px, py = quad_point(p0, p1, p2, t)
-                    xs.append(px); ys.append(py)
-                cx, cy = x, y
-                last_q_ctrl = (x1, y1); last_c_ctrl = None
-
-            elif up == "T":
-                x, y = take(2)
-                if last_q_ctrl is not None:
-                    x1 = 2*cx - last_q_ctrl[0]
-                    y1 = 2*cy - last_q_ctrl[1]
-                else:
-                    x1, y1 = cx, cy
-                p0 = (cx, cy); p1 = (x1, y1); p2 = (x, y)
-                for t in quad_extrema_t(p0, p1, p2):
-                    px, py = quad_point(p0, p1, p2, t)
-                    xs.append(px); ys.append(py)
-                cx, cy = x, y
-                last_q_ctrl = (x1, y1); last_c_ctrl = None
-
-            elif up == "A":
-                # dùng 2 đầu mút
-                rx, ry, rot, laf, swf, x, y = take(7)
-                xs += [cx, x]; ys += [cy, y]
-                cx, cy = x, y
-                last_c_ctrl = last_q_ctrl = None
-
-            elif up == "Z":
-                last_c_ctrl = last_q_ctrl = None
-
-            prev = cmd
-
-        if not xs or not ys:
-            return None
-        return (min(xs), min(ys), max(xs), max(ys))
-
     # 1) Tính bbox tổng cho tất cả strokes
     mins = []; maxs = []
     for d in strokes:
@@ -718,9 +937,18 @@ def center_shapes(strokes, medians, fit=False, pad=0.0):
     medians2=[[[p[0]+tx,p[1]+ty] for p in seg] for seg in medians] if medians else []
     return strokes2, medians2
 
-def convert(svg_path, out_path, no_medians=False, center=False, verbose=False):
+def merge_quad_stats(acc, st):
+    for k in ("cubics", "quads", "before", "after"): acc[k] = acc.get(k, 0) + st[k]
+    acc["max_err"] = max(acc.get("max_err", 0.0), st["max_err"])
+    return acc
+
+def quad_summary(st):
+    return (f"C->Q: {st.get('cubics',0)} cubic -> {st.get('quads',0)} quad, sai số max {st.get('max_err',0.0):.3f}px, "
+            f"path {st.get('before',0)} -> {st.get('after',0)} ký tự (cùng độ làm tròn)")
+
+def convert_root(root, char="", no_medians=False, center=False, verbose=False, median_tol=1.0,
+                 radicals=None, min_rad_conf=0.6, quad_tol=None, quad_digits=1, quad_stats=None):
     t0=time.perf_counter()
-    root=ET.parse(svg_path).getroot()
     minx,miny,w,h=parse_viewbox_or_wh(root)
     sx=TARGET/w; sy=TARGET/h
     if verbose:
@@ -752,8 +980,8 @@ def convert(svg_path, out_path, no_medians=False, center=False, verbose=False):
     if not no_medians:
         mg=find_layer(root,"layer-medians",["median","trục"])
         if mg is not None:
-            extract_medians_recursive(mg,minx,miny,sx,sy,medians)
-        if verbose: print(f"[i] medians: {len(medians)}")
+            extract_medians_recursive(mg,minx,miny,sx,sy,medians,median_tol)
+        if verbose: print(f"[i] medians: {len(medians)} ({sum(len(m) for m in medians)} điểm, tol={median_tol}px)")
     else:
         if verbose: print("[i] medians: skipped (--no-medians)")
 
@@ -761,17 +989,81 @@ def convert(svg_path, out_path, no_medians=False, center=False, verbose=False):
         strokes, medians = center_shapes(strokes, medians)
         if verbose: print("[i] centered to (512,512)")
 
-    data={"character":"", "strokes":strokes, "medians":medians, "radStrokes":[]}
+    # C -> Q sau cùng (sau center) để toạ độ giữ đúng --quad-digits và thống kê khớp output
+    if quad_tol is not None:
+        st={}
+        for k,d in enumerate(strokes):
+            strokes[k],s1=path_to_quads(d,quad_tol,quad_digits); merge_quad_stats(st,s1)
+        if quad_stats is not None: merge_quad_stats(quad_stats,st)
+        if verbose: print(f"[i] {quad_summary(st)} (tol={quad_tol}px)")
+
+    rad=[]
+    if radicals is not None and medians:
+        rad,conf,src=detect_radical({"medians":medians},radicals,min_rad_conf)
+        if verbose: print(f"[i] radStrokes: {rad} (confidence {conf:.3f}, mẫu {src or '-'})")
+
+    return Glyph.from_lists(char, strokes, medians, rad)
+
+def convert_bytes(svg, **opts):
+    """SVG (bytes/str) -> Glyph, không đụng tới đĩa.
+    opts: char, no_medians, center, verbose, median_tol, radicals (RadicalIndex), min_rad_conf,
+          quad_tol / quad_digits (C -> Q), quad_stats (dict cộng dồn thống kê C -> Q)"""
+    return convert_root(ET.fromstring(svg), **opts)
+
+def convert(svg_path, out_path, no_medians=False, center=False, verbose=False, median_tol=1.0,
+            radicals=None, min_rad_conf=0.6, quad_tol=None, quad_digits=1):
+    t0=time.perf_counter(); st={}
+    glyph=convert_root(ET.parse(svg_path).getroot(),no_medians=no_medians,center=center,
+                       verbose=verbose,median_tol=median_tol,radicals=radicals,min_rad_conf=min_rad_conf,
+                       quad_tol=quad_tol,quad_digits=quad_digits,quad_stats=st)
+    if quad_tol is not None and not verbose: print(f"[i] {quad_summary(st)}")
     with open(out_path,"w",encoding="utf-8") as f:
-        json.dump(data,f,ensure_ascii=False,separators=(",",":"))
+        f.write(glyph.to_json())
     if verbose: print(f"[✓] saved: {out_path} (total {time.perf_counter()-t0:.3f}s)")
+    return glyph
+
+def convert_many(src, dst, compression="deflated", level=None, **opts):
+    """Thư mục / .zip chứa *.svg -> thư mục / .zip chứa *.json (đọc ghi trực tiếp, không giải nén tạm)"""
+    t0=time.perf_counter(); n_err=0; st={}
+    if opts.get("quad_tol") is not None: opts["quad_stats"]=st
+    with GlyphSink(dst, compression, level) as sink:
+        for name, raw in iter_entries(src, suffix=".svg"):
+            rel=rel_name(src, name)
+            stem=os.path.basename(rel)[:-4]
+            try:
+                glyph=convert_bytes(raw, char=stem if len(stem)==1 else "", **opts)
+            except (ET.ParseError, RuntimeError) as e:
+                n_err+=1; print(f"[!] {name}: {e}"); continue
+            sink.write(rel[:-4]+".json", glyph.to_json())
+    if st: print(f"[i] {quad_summary(st)}")
+    print(f"[✓] saved: {dst} ({sink.count} glyphs, {n_err} lỗi, {time.perf_counter()-t0:.2f}s)")
+
+def positive_float(s):
+    v=float(s)
+    if not v > 0: raise argparse.ArgumentTypeError(f"phải > 0, gặp {s}")
+    return v
 
 if __name__=="__main__":
     ap=argparse.ArgumentParser()
-    ap.add_argument("input_svg")
-    ap.add_argument("output_json")
+    ap.add_argument("input_svg", help="File .svg, thư mục hoặc .zip chứa *.svg")
+    ap.add_argument("output_json", help="File .json, hoặc thư mục / .zip khi chạy hàng loạt")
     ap.add_argument("--no-medians",action="store_true")
     ap.add_argument("--center",action="store_true")
+    ap.add_argument("--median-tol",type=positive_float,default=1.0,help="Sai số làm phẳng C/S/Q/T/A trong median (px hệ 1024)")
+    ap.add_argument("--compression",choices=["stored","deflated"],default="deflated",help="Khi output là .zip")
+    ap.add_argument("--level",type=int,default=None,help="Mức nén deflate (0-9)")
+    ap.add_argument("--radicals",default=None,help="radical_index.json (radicals.py build) -> tự điền radStrokes")
+    ap.add_argument("--min-rad-conf",type=float,default=0.6)
+    ap.add_argument("--quad-tol",type=positive_float,default=None,
+                    help="Đổi C/S sang ít Q nhất với sai số <= QUAD_TOL px (giống hanzi-writer-data)")
+    ap.add_argument("--quad-digits",type=int,default=1,help="Số chữ số thập phân của path khi dùng --quad-tol")
     ap.add_argument("--verbose",action="store_true")
     args=ap.parse_args()
-    convert(args.input_svg,args.output_json,no_medians=args.no_medians,center=args.center,verbose=args.verbose)
+    rad_opts=dict(radicals=RadicalIndex.load(args.radicals) if args.radicals else None,
+                  min_rad_conf=args.min_rad_conf,quad_tol=args.quad_tol,quad_digits=args.quad_digits)
+    if is_zip(args.input_svg) or os.path.isdir(args.input_svg):
+        convert_many(args.input_svg,args.output_json,args.compression,args.level,no_medians=args.no_medians,
+                     center=args.center,verbose=args.verbose,median_tol=args.median_tol,**rad_opts)
+    else:
+        convert(args.input_svg,args.output_json,no_medians=args.no_medians,center=args.center,verbose=args.verbose,
+                median_tol=args.median_tol,**rad_opts)
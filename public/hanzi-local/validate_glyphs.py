@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kiểm tra glyph JSON cho HanziWriter (output của convert() / center_fit) trước khi lên app
+
+- Schema: character (str), strokes (list[str]), medians (list[list[[x,y]]]), radStrokes (list[int])
+- Số strokes == số medians, radStrokes nằm trong phạm vi
+- Ngữ pháp path: bắt đầu bằng M, đúng số tham số từng lệnh, không có ký tự lạ
+- Outline phải khép kín (Z hoặc điểm cuối trùng điểm đầu subpath)
+- Toạ độ (bbox chính xác của stroke, lệnh tương đối được quy về tuyệt đối, + điểm median) nằm trong --bounds (mặc định 0,0,1024,1024;
+  hanzi-writer-data gốc dùng 0,-124,1024,900)
+- Chạy theo lô trên process pool; xuất diagnostics dạng JSON/JSONL; exit 1 nếu có lỗi
+"""
+
+import re, sys, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from glyph_io import iter_entries, char_of, batched
+from svg_to_hanzi_json import bbox_of_d, TARGET
+
+NUM = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+CMD_CHARS = "MmLlHhVvCcSsQqTtAaZz"
+PATH_TOK_RE = re.compile(r"[" + CMD_CHARS + r"]|" + NUM)
+ARITY = {"M":2,"L":2,"T":2,"H":1,"V":1,"C":6,"S":4,"Q":4,"A":7,"Z":0}
+CMDS = frozenset(CMD_CHARS)
+
+def check_path(d, eps=0.5):
+    """-> (lỗi ngữ pháp hoặc None, closed: bool, path tuyệt đối để tính bbox)"""
+    ts = PATH_TOK_RE.findall(d)
+    rest = PATH_TOK_RE.sub(" ", d).replace(",", " ").split()
+    if rest: return f"ký tự lạ trong path: {rest[0][:12]!r}", False, None
+    if not ts: return "path rỗng", False, None
+    if ts[0] not in ("M","m"): return f"path phải bắt đầu bằng M (gặp {ts[0]!r})", False, None
+    i = 0; cmd = None; cx = cy = 0.0; x0 = y0 = 0.0; closed = True; drawn = False; absd = []
+    while i < len(ts):
+        t = ts[i]
+        if t.isalpha():
+            cmd = t; i += 1
+            if cmd in ("Z","z"):
+                cx, cy = x0, y0; drawn = False; absd.append("Z")
+                continue
+        elif cmd in (None, "Z", "z"):
+            return f"số thừa sau lệnh {cmd!r}: {t}", False, None
+        k = ARITY[cmd.upper()]
+        vals = ts[i:i+k]
+        if len(vals) < k or not CMDS.isdisjoint(vals):
+            return f"lệnh {cmd} thiếu tham số (cần {k})", False, None
+        v = [float(x) for x in vals]; i += k
+        rel = cmd.islower(); up = cmd.upper()
+        if up == "A" and (v[3] not in (0.0, 1.0) or v[4] not in (0.0, 1.0)):
+            return "cờ large-arc/sweep của A phải là 0 hoặc 1", False, None
+        # bản tuyệt đối: lệnh tương đối cộng điểm hiện tại vào mọi cặp toạ độ (A: chỉ điểm cuối)
+        if rel and up == "H": av = [v[0] + cx]
+        elif rel and up == "V": av = [v[0] + cy]
+        elif rel and up == "A": av = v[:5] + [v[5] + cx, v[6] + cy]
+        elif rel: av = [u + (cx if j % 2 == 0 else cy) for j, u in enumerate(v)]
+        else: av = v
+        absd.append(up + " " + " ".join(repr(u) for u in av))
+        if up == "H": cx = av[0]
+        elif up == "V": cy = av[0]
+        else: cx, cy = av[-2], av[-1]
+        if up == "M":
+            if drawn and not (abs(cx-x0) <= eps and abs(cy-y0) <= eps): closed = False
+            x0, y0 = cx, cy; drawn = False
+            cmd = "l" if rel else "L"   # cặp số tiếp theo sau M là L ngầm
+        else:
+            drawn = True
+    if drawn and not (abs(cx-x0) <= eps and abs(cy-y0) <= eps): closed = False
+    return None, closed, " ".join(absd)
+
+def validate_glyph(name, data, bounds=(0.0, 0.0, TARGET, TARGET), require_medians=True):
+    out = []; ch = char_of(name, data if isinstance(data, dict) else None)
+    def diag(level, code, msg, stroke=None):
+        out.append({"file": name, "char": ch, "level": level, "code": code,
+                    "stroke": stroke, "msg": msg})
+    if not isinstance(data, dict):
+        diag("error", "schema", "gốc JSON phải là object"); return out
+    if "character" in data and not isinstance(data["character"], str):
+        diag("error", "schema", "character phải là chuỗi")
+    strokes = data.get("strokes"); medians = data.get("medians"); rad = data.get("radStrokes", [])
+    if not isinstance(strokes, list) or not strokes:
+        diag("error", "schema", "strokes phải là list không rỗng"); return out
+    if medians is None and not require_medians: medians = []
+    if not isinstance(medians, list):
+        diag("error", "schema", "medians phải là list"); medians = []
+    if not isinstance(rad, list) or any(not isinstance(r, int) or isinstance(r, bool) for r in rad):
+        diag("error", "schema", "radStrokes phải là list số nguyên"); rad = []
+    if require_medians and len(medians) != len(strokes):
+        diag("error", "count-mismatch", f"{len(strokes)} strokes nhưng {len(medians)} medians")
+    for r in rad:
+        if not 0 <= r < len(strokes):
+            diag("error", "rad-range", f"radStrokes chứa {r} ngoài 0..{len(strokes)-1}")
+
+    bx0, by0, bx1, by1 = bounds
+    def outside(x0, y0, x1, y1):
+        return x0 < bx0 or y0 < by0 or x1 > bx1 or y1 > by1
+
+    for k, d in enumerate(strokes):
+        if not isinstance(d, str):
+            diag("error", "schema", "stroke phải là chuỗi path", k); continue
+        err, closed, absd = check_path(d)
+        if err:
+            diag("error", "path-grammar", err, k); continue
+        if not closed:
+            diag("warning", "open-outline", "outline không khép kín", k)
+        bb = bbox_of_d(absd)
+        if bb and outside(*bb):
+            diag("error", "out-of-bounds",
+                 f"bbox ({bb[0]:.1f},{bb[1]:.1f})–({bb[2]:.1f},{bb[3]:.1f}) ngoài khung", k)
+
+    for k, seg in enumerate(medians):
+        if not isinstance(seg, list) or any(
+                not isinstance(p, list) or len(p) != 2 or
+                any(not isinstance(v, (int, float)) or isinstance(v, bool) for v in p) for p in seg):
+            diag("error", "schema", "median phải là list các điểm [x, y]", k); continue
+        if len(seg) < 2:
+            diag("error", "degenerate", "median có ít hơn 2 điểm", k)
+        if any(outside(x, y, x, y) for x, y in seg):
+            diag("error", "out-of-bounds", "median có điểm ngoài khung", k)
+    return out
+
+def validate_batch(batch, bounds, require_medians):
+    out = []
+    for name, raw in batch:
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            out.append({"file": name, "char": char_of(name), "level": "error",
+                        "code": "json", "stroke": None, "msg": str(e)})
+            continue
+        out += validate_glyph(name, data, bounds, require_medians)
+    return len(batch), out
+
+def validate(sources, workers=None, batch=256, bounds=(0.0, 0.0, TARGET, TARGET), require_medians=True):
+    def entries():
+        for src in sources: yield from iter_entries(src)
+    total = 0; diags = []
+    if workers == 1:
+        results = (validate_batch(b, bounds, require_medians) for b in batched(entries(), batch))
+        for n, ds in results: total += n; diags += ds
+        return total, diags
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(validate_batch, b, bounds, require_medians) for b in batched(entries(), batch)]
+        for f in futs:
+            n, ds = f.result(); total += n; diags += ds
+    return total, diags
+
+if __name__=="__main__":
+    ap=argparse.ArgumentParser()
+    ap.add_argument("sources", nargs="+", help="Thư mục, file .zip hoặc file .json")
+    ap.add_argument("-o","--output", default=None, help="Ghi diagnostics (.json hoặc .jsonl); mặc định in ra stdout")
+    ap.add_argument("--bounds", default="0,0,1024,1024", help="minx,miny,maxx,maxy")
+    ap.add_argument("--allow-missing-medians", action="store_true")
+    ap.add_argument("--strict", action="store_true", help="Coi warning là lỗi (exit 1)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--batch", type=int, default=256)
+    args=ap.parse_args()
+
+    t0=time.perf_counter()
+    bounds=tuple(float(v) for v in args.bounds.split(","))
+    if len(bounds)!=4: ap.error("--bounds cần 4 số")
+    total,diags=validate(args.sources,workers=args.workers,batch=args.batch,bounds=bounds,
+                         require_medians=not args.allow_missing_medians)
+    if args.output and args.output.lower().endswith(".json"):
+        with open(args.output,"w",encoding="utf-8") as f:
+            json.dump(diags,f,ensure_ascii=False,indent=1)
+    else:
+        f=open(args.output,"w",encoding="utf-8") if args.output else sys.stdout
+        for d in diags: f.write(json.dumps(d,ensure_ascii=False)+"\n")
+        if args.output: f.close()
+    n_err=sum(1 for d in diags if d["level"]=="error")
+    n_warn=len(diags)-n_err
+    print(f"[{'✓' if not n_err else '!'}] {total} glyphs: {n_err} lỗi, {n_warn} cảnh báo "
+          f"({time.perf_counter()-t0:.2f}s)", file=sys.stderr)
+    sys.exit(1 if n_err or (args.strict and n_warn) else 0)
@@ -12,6 +12,7 @@ import ReviewMode from './components/ReviewMode'; // <--- Đã thêm import Revi
 
 import { GRID_DEFAULTS } from './utils/misc';
 import { loadCharCategories } from './utils/charLists';
+import { loadLessonPack } from './utils/hanzi';
 import { SpeedInsights } from '@vercel/speed-insights/react';
 
 import {
@@ -63,6 +64,11 @@ export default function App() {
 
   const fileChars = useMemo(() => currentCat?.chars || [], [currentCat]);
 
+  // Nạp sẵn glyph của cả bài (1 request) trước khi Stage/StepsGrid tải từng chữ
+  useEffect(() => {
+    if (charSource === 'list' && currentCat) loadLessonPack(currentCat.id);
+  }, [charSource, currentCat]);
+
   // Mảng ký tự dùng chung cho toàn app
   const chars = useMemo(
     () => (charSource === 'manual' ? manualChars : fileChars),
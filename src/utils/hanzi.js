@@ -29,13 +29,27 @@ for (const path in pkgModules) {
 }
 
 const charCache = new Map();
+let pendingPack = null;
+
+// Manifest ký tự -> file đã hash (public/hanzi-assets/manifest.json).
+// Chỉ manifest là no-cache; file glyph đổi tên khi nội dung đổi.
+let manifestPromise = null;
+
+function loadAssetManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetch('/hanzi-assets/manifest.json', { cache: 'no-cache' })
+      .then(res => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
 
 /**
  * Tải dữ liệu ký tự theo thứ tự ưu tiên:
  *
  *  1. Cache in-memory (tránh fetch lặp lại)
  *  2. npm package  (hanzi-writer-data đã cài — chữ phổ thông, nhanh nhất)
- *  3. /hanzi-local (public folder — override cục bộ, dev/test)
+ *  3. /hanzi-assets (bản hash theo manifest, chỉ bản build) rồi /hanzi-local (override cục bộ, dev/test)
  *  4. Fork CDN     (github fork của bạn — chữ hiếm/tự vẽ)
  *  5. Official CDN (cdn.jsdelivr.net/npm/hanzi-writer-data — fallback cuối)
  *
@@ -45,8 +59,12 @@ const charCache = new Map();
 export async function loadCharData(char) {
   const key = char.normalize('NFC');
 
-  // 1) Cache
+  // 1) Cache (đợi pack bài học đang tải, nếu có)
   if (charCache.has(key)) return charCache.get(key);
+  if (pendingPack) {
+    await pendingPack;
+    if (charCache.has(key)) return charCache.get(key);
+  }
 
   // 2) npm package (bundle sẵn trong node_modules)
   const loader = pkgIndex[key];
@@ -57,9 +75,24 @@ export async function loadCharData(char) {
     return data;
   }
 
+  // 3a) /hanzi-assets — bản đã hash (cache immutable), xem fingerprint_glyphs.py
+  //     Bỏ qua khi dev để sửa hanzi-local/*.json là thấy ngay (không bị bản hash cũ che)
+  const manifest = import.meta.env.DEV ? null : await loadAssetManifest();
+  const asset = manifest?.files?.[key];
+  if (asset) {
+    try {
+      const res = await fetch(`${manifest.base}/${asset.file}`);
+      if (res.ok) {
+        const data = await res.json();
+        charCache.set(key, data);
+        return data;
+      }
+    } catch { /* bỏ qua */ }
+  }
+
   const encoded = encodeURIComponent(key);
 
-  // 3) /hanzi-local — public folder (dùng để override hoặc test nhanh)
+  // 3b) /hanzi-local — public folder (dùng để override hoặc test nhanh)
   try {
     const res = await fetch(`/hanzi-local/${encoded}.json`, { cache: 'no-store' });
     if (res.ok) {
@@ -85,4 +118,42 @@ export async function loadCharData(char) {
   const data = await res.json();
   charCache.set(key, data);
   return data;
-}
\ No newline at end of file
+}
+
+/**
+ * Nạp sẵn cả bài học từ pack (public/hanzi-packs/<id>.json, tạo bởi
+ * public/hanzi-local/build_lesson_packs.py) — 1 request + 1 lần JSON.parse.
+ *
+ * Glyph trong pack được đưa vào cache, nên loadCharData sau đó trả về ngay.
+ * Không có pack (chưa build) -> trả về null, app tự fallback tải từng chữ.
+ */
+const packCache = new Map();
+
+export async function loadLessonPack(id) {
+  if (!id) return null;
+  if (packCache.has(id)) return packCache.get(id);
+
+  const p = (async () => {
+    let pack = null;
+    try {
+      const res = await fetch(`/hanzi-packs/${encodeURIComponent(id)}.json`);
+      if (res.ok) pack = await res.json();
+    } catch { /* bỏ qua */ }
+
+    if (pack?.items) {
+      for (const it of pack.items) {
+        const key = it.char.normalize('NFC');
+        if (it.data && !charCache.has(key)) charCache.set(key, it.data);
+      }
+    }
+    return pack;
+  })();
+
+  packCache.set(id, p);
+  pendingPack = p;
+  try {
+    return await p;
+  } finally {
+    if (pendingPack === p) pendingPack = null;
+  }
+}